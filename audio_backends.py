@@ -0,0 +1,192 @@
+import abc
+import ctypes
+import os
+import shutil
+import tempfile
+import threading
+import time
+import wave
+from array import array
+from collections import deque
+from latency import latency
+from logutil import log
+from pcm import PcmClip, convert, mix_into, to_wav_bytes
+
+
+class AudioBackend(abc.ABC):
+    name = "base"
+    # True when plain plays are rendered from the decoded PCM cache, only then is pre-decoding worth it
+    consumes_pcm = False
+
+    # Backends call latency.mark_played(latency.current()) right before the sound leaves the plugin
+
+    @abc.abstractmethod
+    def play(self, path: str, volume: float) -> bool:
+        ...
+
+    @abc.abstractmethod
+    def play_clip(self, clip: PcmClip, key: str) -> bool:
+        # Already mixed and volume scaled audio, key identifies the mix for backends that cache it
+        ...
+
+    def warm(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class DllBackend(AudioBackend):
+    """BeepBeepPlay.dll, loaded once and kept for the lifetime of the backend."""
+
+    name = "dll"
+
+    def __init__(self, dll_path: str):
+        self.dll_path = dll_path
+        self._play_fn = None
+        self._failed = False
+        self._lock = threading.Lock()
+        self._mix_dir = os.path.join(tempfile.gettempdir(), f"BeepBeep-{os.getpid()}")
+
+    def _load(self):
+        if self._play_fn or self._failed:
+            return self._play_fn
+
+        with self._lock:
+            if self._play_fn or self._failed:
+                return self._play_fn
+
+            if not os.path.isfile(self.dll_path):
+                log.info("Cannot find BeepBeepPlay.dll in %s", self.dll_path)
+                self._failed = True
+                return None
+
+            try:
+                dll = ctypes.CDLL(self.dll_path)
+                play = dll.BeepBeepPlay
+                play.argtypes = [ctypes.c_char_p, ctypes.c_float]
+                play.restype = ctypes.c_int
+            except (OSError, AttributeError) as e:
+                log.error("Failed to load %s: %s", self.dll_path, e)
+                self._failed = True
+                return None
+
+            self._play_fn = play
+            return play
+
+    def warm(self):
+        self._load()
+
+    def play(self, path: str, volume: float) -> bool:
+        play = self._load()
+        if not play:
+            return False
+
+        try:
+            latency.mark_played(latency.current())
+            play(path.encode("utf-8"), volume)
+        except (OSError, AttributeError, TypeError) as e:
+            log.error("Failed to play sound %s: %s", path, e)
+            return False
+        return True
+
+    def play_clip(self, clip: PcmClip, key: str) -> bool:
+        # The DLL only takes a path, each distinct mix is written once and reused
+        path = os.path.join(self._mix_dir, f"mix_{key}.wav")
+        if not os.path.isfile(path):
+            try:
+                os.makedirs(self._mix_dir, exist_ok=True)
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(to_wav_bytes(clip))
+                os.replace(tmp_path, path)
+            except OSError as e:
+                log.error("Failed to write mixed sound %s: %s", path, e)
+                return False
+        return self.play(path, 1.0)
+
+    def close(self):
+        shutil.rmtree(self._mix_dir, ignore_errors=True)
+
+
+class MixerBackend(AudioBackend):
+    """Pure Python mixer rendering into a ring buffer of the last few seconds, optionally dumped to a WAV file."""
+
+    name = "mixer"
+    consumes_pcm = True
+
+    def __init__(self, cache, sink_path: str | None = None, seconds: float = 10.0,
+                 channels: int = 2, frame_rate: int = 44100):
+        self.cache = cache
+        self.sink_path = sink_path
+        self.channels = channels
+        self.frame_rate = frame_rate
+        self.ring = array("h", bytes(int(seconds * frame_rate) * channels * 2))
+        self.plays = 0
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _offset(self, at: float) -> int:
+        frame = int((at - self._start) * self.frame_rate)
+        return (frame * self.channels) % len(self.ring)
+
+    def play_clip(self, clip: PcmClip, key: str) -> bool:
+        return self.play_at(clip)
+
+    def play_at(self, clip: PcmClip, at: float | None = None) -> bool:
+        samples = convert(clip, self.channels, self.frame_rate)
+        offset = self._offset(time.perf_counter() if at is None else at)
+
+        with self._lock:
+            latency.mark_played(latency.current())
+            first = samples[:len(self.ring) - offset]
+            mix_into(self.ring, offset, first)
+            if len(first) < len(samples):
+                mix_into(self.ring, 0, samples[len(first):])
+            self.plays += 1
+        return True
+
+    def play(self, path: str, volume: float) -> bool:
+        clip = self.cache.get(path, volume)
+        if clip is None:
+            log.info("Mixer backend cannot decode %s", path)
+            return False
+        return self.play_at(clip)
+
+    def dump(self, path: str):
+        with self._lock:
+            # Oldest audio starts right after the current write position
+            offset = self._offset(time.perf_counter())
+            ordered = self.ring[offset:] + self.ring[:offset]
+
+        with wave.open(path, "wb") as w:
+            w.setnchannels(self.channels)
+            w.setsampwidth(2)
+            w.setframerate(self.frame_rate)
+            w.writeframes(ordered.tobytes())
+
+    def close(self):
+        if self.sink_path:
+            try:
+                self.dump(self.sink_path)
+            except (OSError, wave.Error):
+                log.exception("Failed to write mixer output to %s", self.sink_path)
+
+
+class NullBackend(AudioBackend):
+    """Plays nothing, keeps (perf_counter, path, volume) of every request for benchmarks."""
+
+    name = "null"
+
+    def __init__(self, size: int = 100_000):
+        self.events: deque[tuple[float, str, float]] = deque(maxlen=size)
+
+    def play(self, path: str, volume: float) -> bool:
+        latency.mark_played(latency.current())
+        self.events.append((time.perf_counter(), path, volume))
+        return True
+
+    def play_clip(self, clip: PcmClip, key: str) -> bool:
+        latency.mark_played(latency.current())
+        self.events.append((time.perf_counter(), f"<mix {key}>", 1.0))
+        return True
@@ -0,0 +1,266 @@
+import hashlib
+import os
+import threading
+import wave
+from collections import OrderedDict
+from audio_backends import AudioBackend, DllBackend, MixerBackend, NullBackend
+from beep_beep_config import config
+from logutil import log
+from pcm import PcmClip, decode_wav, mix, scale
+from sound_analysis import SoundStats, normalization_gain
+from sound_loader import sound_inst
+
+
+class PcmCache:
+    """LRU of decoded clips keyed by (path, gain), bounded by total sample bytes."""
+
+    def __init__(self, limit_bytes: int):
+        self.limit_bytes = limit_bytes
+        self.nbytes = 0
+        self._entries: OrderedDict[tuple[str, float], PcmClip] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: tuple[str, float]) -> PcmClip | None:
+        with self._lock:
+            clip = self._entries.get(key)
+            if clip is not None:
+                self._entries.move_to_end(key)
+            return clip
+
+    def _store(self, key: tuple[str, float], clip: PcmClip):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            if clip.nbytes > self.limit_bytes:
+                return
+            self._entries[key] = clip
+            self.nbytes += clip.nbytes
+            while self.nbytes > self.limit_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def get(self, path: str, gain: float = 1.0) -> PcmClip | None:
+        gain = round(gain, 3)
+        key = (path, gain)
+        clip = self._lookup(key)
+        if clip is not None:
+            return clip
+
+        if not path.lower().endswith(".wav"):
+            return None
+
+        base = self._lookup((path, 1.0))
+        if base is None:
+            try:
+                base = decode_wav(path)
+            except (OSError, EOFError, ValueError, wave.Error) as err:
+                log.info("Cannot decode %s: %s", path, err)
+                return None
+            self._store((path, 1.0), base)
+
+        if gain == 1.0:
+            return base
+
+        clip = PcmClip(scale(base.samples, gain), base.channels, base.frame_rate)
+        self._store(key, clip)
+        return clip
+
+    def invalidate(self, path: str):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                self.nbytes -= self._entries.pop(key).nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AudioEngine:
+    """Owns the audio backend for the lifetime of the plugin and the resolved sound paths."""
+
+    def __init__(self, cache_limit_bytes: int = 32 * 1024 * 1024):
+        self.plugin_dir = os.path.dirname(__file__)
+        self.sounds_dir = os.path.join(self.plugin_dir, "sounds")
+        self.dll_path = os.path.join(self.plugin_dir, "BeepBeepPlay.dll")
+        self.cache = PcmCache(cache_limit_bytes)
+        self._backend: AudioBackend | None = None
+        self._backend_lock = threading.Lock()
+        self._paths: dict[str, str] = {}
+        self._signatures: dict[str, tuple[int, int]] = {}
+        self._neutral_path: str | None = None
+        self._map_version: int | None = None
+        self._refresh_lock = threading.Lock()
+        self._warm_thread: threading.Thread | None = None
+        self._warm_gain: float | None = None
+        self._gains: dict[str, float] = {}
+        self._gains_version = 0
+        self._mixes: OrderedDict[tuple, PcmClip] = OrderedDict()
+        self._mix_lock = threading.Lock()
+        self.max_mixes = 16
+        sound_inst.subscribe(self._on_sounds_changed)
+        config.subscribe(lambda _snapshot, _changed: self.update_gains(), ("normalize_target_dbfs",))
+
+    def create_backend(self, name: str) -> AudioBackend:
+        if name == MixerBackend.name:
+            sink = config.get_config("audio_sink_path", None)
+            if sink and not os.path.isabs(sink):
+                sink = os.path.join(self.plugin_dir, sink)
+            return MixerBackend(self.cache, sink)
+        if name == NullBackend.name:
+            return NullBackend()
+        if name != DllBackend.name:
+            log.info("Unknown audio backend '%s', using dll", name)
+        return DllBackend(self.dll_path)
+
+    @property
+    def backend(self) -> AudioBackend:
+        name = config.get_config("audio_backend", DllBackend.name)
+        backend = self._backend
+        if backend and backend.name == name:
+            return backend
+
+        with self._backend_lock:
+            backend = self._backend
+            if backend and backend.name == name:
+                return backend
+            if backend:
+                backend.close()
+            self._backend = self.create_backend(name)
+            log.info("Using %s audio backend", self._backend.name)
+            return self._backend
+
+    def _refresh_paths(self):
+        if sound_inst.version == self._map_version:
+            return
+
+        with self._refresh_lock:
+            version = sound_inst.version
+            if version == self._map_version:
+                return
+
+            # The loader already stat'ed every file, only clips whose (mtime, size) moved are dropped
+            info = sound_inst.sound_info
+            signatures = {path: (sf.mtime_ns, sf.size) for path, sf in info.values()}
+            for path, signature in self._signatures.items():
+                if signatures.get(path) != signature:
+                    self.cache.invalidate(path)
+
+            paths = {name: path for name, (path, _) in info.items()}
+            self._neutral_path = paths.get("neutral")
+            self._paths = paths
+            self._signatures = signatures
+            self._map_version = version
+            with self._mix_lock:
+                self._mixes.clear()
+
+    def _on_sounds_changed(self):
+        self._refresh_paths()
+        if self._warm_gain is not None:
+            self.start_warmup(self._warm_gain)
+
+    @property
+    def normalize(self) -> bool:
+        return config.get_config("normalize_sounds", False)
+
+    def update_gains(self):
+        """Precomputes the loudness normalization gain of every analysed sound."""
+        target = float(config.get_config("normalize_target_dbfs", -24.0))
+        self._gains = {path: normalization_gain(stats, target) for path, stats in sound_inst.stats.items()}
+        self._gains_version += 1
+        with self._mix_lock:
+            self._mixes.clear()
+
+    def gain_for(self, path: str) -> float:
+        return self._gains.get(path, 1.0) if self.normalize else 1.0
+
+    def asset_stats(self) -> list[tuple[str, SoundStats | None, float]]:
+        """(name, stats, normalization gain) of every mapped sound, from the analysis cache only."""
+        self._refresh_paths()
+        stats = sound_inst.stats
+        return [(name, stats.get(path), self._gains.get(path, 1.0)) for name, path in sorted(self._paths.items())]
+
+    def resolve(self, base_name: str) -> str | None:
+        self._refresh_paths()
+        return self._paths.get(base_name) or self._neutral_path
+
+    def clip(self, base_name: str, gain: float = 1.0) -> PcmClip | None:
+        path = self.resolve(base_name)
+        return self.cache.get(path, gain) if path else None
+
+    def warm(self, gain: float = 1.0):
+        """Loads the backend and analyses the sounds, pre-decodes them only for backends that render PCM."""
+        self.backend.warm()
+        self._refresh_paths()
+        analysed = sound_inst.analyse()
+        if analysed:
+            log.info("Analysed %d sounds", analysed)
+        self.update_gains()
+        backend = self.backend
+        if not backend.consumes_pcm:
+            # The DLL is handed a path and reads the file from disk on every beep, decoding everything
+            # here would only churn the cache. Mixes and boosted clips are decoded on first use.
+            log.info("%s backend does not play decoded PCM, sound cache not pre-filled", backend.name)
+            return
+        for path in set(self._paths.values()):
+            self.cache.get(path, gain * self.gain_for(path))
+        log.info("Sound cache warmed: %d clips, %.1f KiB", len(self.cache), self.cache.nbytes / 1024)
+
+    def start_warmup(self, gain: float = 1.0):
+        self._warm_gain = gain
+        if self._warm_thread and self._warm_thread.is_alive():
+            return
+        self._warm_thread = threading.Thread(target=self.warm, args=(gain,), daemon=True, name="BeepBeepSoundWarmup")
+        self._warm_thread.start()
+
+    def play_file(self, path: str, volume: float) -> bool:
+        gain = volume * self.gain_for(path)
+        if gain > 1.0:
+            # Backends only attenuate, a boost goes through the pre-scaled PCM cache
+            clip = self.cache.get(path, gain)
+            if clip is not None:
+                key = (path, self._signatures.get(path), round(gain, 3))
+                return self.backend.play_clip(clip, hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16])
+            gain = 1.0
+        return self.backend.play(path, gain)
+
+    def play_mix(self, names: list[str], volume: float) -> bool:
+        """Plays every sound at once as a single mixed clip, False if one of them cannot be decoded."""
+        paths = sorted(p for p in (self.resolve(n) for n in names) if p)
+        if not paths:
+            return False
+
+        key = (self._map_version, tuple(paths), round(volume, 3), self.normalize and self._gains_version)
+        with self._mix_lock:
+            clip = self._mixes.get(key)
+            if clip is not None:
+                self._mixes.move_to_end(key)
+
+        if clip is None:
+            voices = []
+            for path in paths:
+                voice = self.cache.get(path, volume * self.gain_for(path))
+                if voice is None:
+                    return False
+                voices.append((voice, 1.0))
+
+            clip = mix(voices)
+            with self._mix_lock:
+                self._mixes[key] = clip
+                while len(self._mixes) > self.max_mixes:
+                    self._mixes.popitem(last=False)
+
+        return self.backend.play_clip(clip, hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16])
+
+    def close(self):
+        with self._backend_lock:
+            if self._backend:
+                self._backend.close()
+                self._backend = None
+
+
+audio_engine = AudioEngine()
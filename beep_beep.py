@@ -1,16 +1,38 @@
 import datetime
 import os
-import ctypes
-import threading
+from audio_engine import audio_engine
+from beep_coalescer import BeepCoalescer
 from logutil import log
-from beep_beep_config import config
+from beep_beep_config import ConfigSnapshot, config
 from commander_history import history_inst
+from latency import LatencyTrace, latency
+from sound_dispatcher import SoundDispatcher
 from sound_loader import sound_inst
 
 class BeepBeep:
+    # Burst cue ranking, custom sounds rank with neutral
+    SEVERITY = {"foe": 2, "neutral": 1, "friend": 0}
+
     def __init__(self):
         self.last_beep = datetime.datetime.min
         self.plugin_dir = os.path.dirname(__file__)
+        self.spacing = 0.2
+        self.dispatcher = SoundDispatcher(self._play_job)
+        self.coalescer = BeepCoalescer()
+        self.gain = 1.0
+        config.subscribe(self._on_volume, ("volume",))
+        config.subscribe(self._on_coalescer, ("beep_cooldown", "beep_rate", "beep_rate_window", "burst_threshold"))
+
+    def _on_volume(self, snapshot: ConfigSnapshot, _changed: set[str]):
+        self.gain = snapshot.get("volume", 100) / 100.0
+
+    def _on_coalescer(self, snapshot: ConfigSnapshot, _changed: set[str]):
+        self.coalescer.configure(
+            snapshot.get("beep_cooldown", 5.0),
+            snapshot.get("beep_rate", 6),
+            snapshot.get("beep_rate_window", 10.0),
+            snapshot.get("burst_threshold", 5)
+        )
 
     @property
     def volume(self) -> float:
@@ -24,44 +46,50 @@ class BeepBeep:
     def sounds(self) -> int:
         return config.get_config("sounds", 1)
 
+    @property
+    def mix_sounds(self) -> bool:
+        return config.get_config("mix_sounds", True)
+
+    def _play_job(self, item: str | tuple[str, ...], trace: LatencyTrace | None):
+        if isinstance(item, tuple):
+            self.play_mix(list(item), trace)
+        else:
+            self.play_sound(item, trace)
 
-    def play_sound(self, base_name: str):
+
+    def play_sound(self, base_name: str, trace: LatencyTrace | None = None):
         if self.mute or base_name.lower() == "none":
             return
         
-        file_to_play = sound_inst.sound_map.get(base_name)
-    
-        if not file_to_play or file_to_play == "none":
-            file_to_play = sound_inst.neutral
-            if not file_to_play:
-                log.info("No neutral sound loaded, cannot play '%s'", base_name)
-                return
-    
-        full_path = os.path.join(self.plugin_dir, "sounds", file_to_play)
-        dll_path = os.path.join(self.plugin_dir, "BeepBeepPlay.dll")
-    
-        if not os.path.isfile(dll_path):
-            log.info("Cannot find BeepBeepPlay.dll in %s", dll_path)
+        full_path = audio_engine.resolve(base_name)
+        if not full_path:
+            log.info("No sound or neutral fallback found, cannot play '%s'", base_name)
             return
     
-        if not os.path.isfile(full_path):
-            log.info("Cannot find sound %s, trying neutral instead", full_path)
-            full_path = os.path.join(self.plugin_dir, "sounds", sound_inst.neutral)
-            if not os.path.isfile(full_path):
-                log.info("No neutral sound found, cannot play '%s'", base_name)
-                return
-    
-        vol = self.volume / 100.0
-    
-        try:
-            dll = ctypes.CDLL(dll_path)
-            dll.BeepBeepPlay.argtypes = [ctypes.c_char_p, ctypes.c_float]
-            dll.BeepBeepPlay.restype = ctypes.c_int
-            dll.BeepBeepPlay(full_path.encode("utf-8"), vol)
-        except (OSError, AttributeError, TypeError) as e:
-            log.error("Failed to play sound %s: %s", full_path, e)
+        # The backend marks the trace played right where it hands the sound over
+        with latency.active(trace):
+            audio_engine.play_file(full_path, self.gain)
+
+    def play_mix(self, names: list[str], trace: LatencyTrace | None = None):
+        if self.mute:
+            return
+
+        names = [n for n in names if n.lower() != "none"]
+        if not names:
+            return
+
+        with latency.active(trace):
+            mixed = audio_engine.play_mix(names, self.gain)
+        if not mixed:
+            # Something could not be decoded (mp3), fall back to playing them one after another
+            self.dispatcher.submit(names, self.spacing, trace, replace=False)
 
         
+    @classmethod
+    def most_severe(cls, sounds: list[str]) -> str:
+        """The sound a burst plays, a foe in the group must never be announced as neutral."""
+        return max(sounds, key=lambda name: cls.SEVERITY.get(os.path.splitext(name)[0].lower(), 1))
+
     def handle_event(self, info: dict | list[dict]):
         if not isinstance(info, list):
             info = [info]
@@ -70,7 +98,8 @@ class BeepBeep:
             return
     
         now = datetime.datetime.utcnow()
-        possible_sounds: list[str] = []
+        candidates: list[dict] = []
+        selected_sounds: dict[str, str] = {}
     
         for entry in info:
             cmdr_id = entry["commander_id"]
@@ -79,21 +108,33 @@ class BeepBeep:
             if selected in ("none.wav", "none"):
                 continue
     
-            possible_sounds.append(selected)
-            history_inst.seen_data[cmdr_id] = existing
+            candidates.append(entry)
+            selected_sounds[cmdr_id] = selected
+    
+        allowed, burst = self.coalescer.filter(candidates)
+    
+        if burst:
+            sound = self.most_severe([selected_sounds[entry["commander_id"]] for entry in allowed])
+            log.info("%d commanders arrived at once, playing a single %s cue", len(allowed), sound)
+            possible_sounds = [sound]
+        else:
+            possible_sounds = [selected_sounds[entry["commander_id"]] for entry in allowed]
     
         if possible_sounds:
             self.last_beep = now
-            history_inst.save_seen_commanders()
-            self._schedule_sounds(possible_sounds)
+            trace = latency.current()
+            latency.mark_dispatched(trace)
+            self._schedule_sounds(possible_sounds, trace)
         
-    def _schedule_sounds(self, sounds: list[str]):
-        max_sounds = self.sounds
-        for i, sound_file in enumerate(sounds[:max_sounds]):
-            threading.Timer(
-                i * 0.2,
-                lambda s=sound_file: self.play_sound(s)
-            ).start()
+    def _schedule_sounds(self, sounds: list[str], trace: LatencyTrace | None = None):
+        voices = sounds[:self.sounds]
+        if len(sounds) > len(voices):
+            log.info("%d sounds over the limit of %d were not played", len(sounds) - len(voices), len(voices))
+    
+        if len(voices) > 1 and self.mix_sounds:
+            self.dispatcher.submit([tuple(voices)], 0.0, trace)
+        else:
+            self.dispatcher.submit(voices, self.spacing, trace)
            
 beep_inst = BeepBeep()
 
@@ -1,44 +1,86 @@
 import os
 import json
 import threading
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping
+from persister import atomic_write_json, persister
+
+
+class ConfigSnapshot:
+    """Immutable view of the config at one version, replaced as a whole on every change."""
+
+    __slots__ = ("version", "values")
+
+    def __init__(self, version: int, values: dict):
+        self.version = version
+        self.values: Mapping[str, Any] = MappingProxyType(values)
+
+    def get(self, attr: str, default=None):
+        return self.values.get(attr, default)
+
 
 class BeepBeepConfig:
     def __init__(self):
         self.plugin_dir = os.path.dirname(__file__)
         self.config_file = "beepbeep_config.json"
-        self.lock = threading.Lock()
-        self.config = {}
+        # Only writers take the lock, readers just grab the current snapshot reference
+        self.lock = threading.RLock()
+        self.snapshot = ConfigSnapshot(0, {})
+        self._listeners: list[tuple[Callable[[ConfigSnapshot, set[str]], None], frozenset[str] | None]] = []
         self.load_config()
 
+    @property
+    def config(self) -> Mapping[str, Any]:
+        return self.snapshot.values
+
     def load_config(self):
         path = os.path.join(self.plugin_dir, self.config_file)
         if os.path.isfile(path):
             try:
                 with open(path, "r", encoding="utf-8") as f:
                     data = json.load(f)
-                with self.lock:
-                    self.config.update(data)
-                    
+                self.update_config(data)
             except (OSError, json.JSONDecodeError):
                 pass
 
     def save_config(self):
+        persister.schedule("config", self._write_config)
+
+    def _write_config(self):
         path = os.path.join(self.plugin_dir, self.config_file)
+        data = dict(self.snapshot.values)
         try:
-            with self.lock:
-                with open(path, "w", encoding="utf-8") as f:
-                    json.dump(self.config, f, indent=2)
-                    
-        except (OSError, json.JSONDecodeError):
+            atomic_write_json(path, data)
+        except (OSError, TypeError, ValueError):
             pass
 
     def get_config(self, attr: str, default=None):
-        with self.lock:
-            return self.config.get(attr, default)
+        return self.snapshot.values.get(attr, default)
 
     def set_config(self, attr: str, value):
+        self.update_config({attr: value})
+
+    def update_config(self, changes: Mapping[str, Any]):
+        """Copy on write, listeners only hear about keys whose value actually changed."""
         with self.lock:
-            self.config[attr] = value
+            current = self.snapshot
+            changed = {k for k, v in changes.items() if k not in current.values or current.values[k] != v}
+            if not changed:
+                return
+            values = dict(current.values)
+            values.update((k, changes[k]) for k in changed)
+            snapshot = ConfigSnapshot(current.version + 1, values)
+            self.snapshot = snapshot
 
-config = BeepBeepConfig()
+            # Still under the lock so listeners see versions in order
+            for cb, keys in list(self._listeners):
+                if keys is None or keys & changed:
+                    cb(snapshot, changed)
 
+    def subscribe(self, cb: Callable[[ConfigSnapshot, set[str]], None], keys: Iterable[str] | None = None):
+        """cb(snapshot, changed_keys) runs on the writing thread, once now so it can seed cached values."""
+        with self.lock:
+            self._listeners.append((cb, frozenset(keys) if keys is not None else None))
+            cb(self.snapshot, set(keys or ()))
+
+config = BeepBeepConfig()
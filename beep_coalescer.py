@@ -0,0 +1,94 @@
+import heapq
+import threading
+import time
+
+
+class BeepCoalescer:
+    """Sits between detection and playback: per commander cooldowns, a global rate limit and burst collapsing.
+
+    Cooldowns live in a dict with a heap of (expires_at, cmdr_id) next to it, so expiry only touches
+    entries that are actually due and memory stays bounded by the commanders seen within one cooldown.
+    """
+
+    def __init__(self, cooldown: float = 5.0, rate: int = 6, window: float = 10.0, burst_threshold: int = 5):
+        self.cooldown = cooldown
+        self.rate = rate
+        self.window = window
+        self.burst_threshold = burst_threshold
+        self._expires: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._tokens = float(rate)
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+        self.suppressed = 0
+        self.bursts = 0
+
+    def configure(self, cooldown: float, rate: int, window: float, burst_threshold: int):
+        with self._lock:
+            self.cooldown = cooldown
+            self.rate = rate
+            self.window = window
+            self.burst_threshold = burst_threshold
+            self._tokens = min(self._tokens, float(rate))
+
+    def _expire(self, now: float):
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires_at, cmdr_id = heapq.heappop(heap)
+            if self._expires.get(cmdr_id) == expires_at:
+                del self._expires[cmdr_id]
+
+    def _refill(self, now: float):
+        if self.window > 0:
+            elapsed = max(0.0, now - self._refilled)
+            self._tokens = min(float(self.rate), self._tokens + elapsed * self.rate / self.window)
+        self._refilled = now
+
+    def filter(self, entries: list[dict], now: float | None = None) -> tuple[list[dict], bool]:
+        """Returns the entries allowed to beep and whether they should collapse into one summary cue."""
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            self._expire(now)
+            self._refill(now)
+
+            fresh = []
+            for entry in entries:
+                cmdr_id = entry["commander_id"]
+                if cmdr_id in self._expires:
+                    self.suppressed += 1
+                    continue
+                fresh.append(entry)
+
+            if not fresh:
+                return [], False
+
+            if self.burst_threshold and len(fresh) >= self.burst_threshold:
+                if self.rate > 0:
+                    if self._tokens < 1:
+                        self.suppressed += len(fresh)
+                        return [], False
+                    self._tokens -= 1
+                self.bursts += 1
+                self._start_cooldowns(fresh, now)
+                return fresh, True
+
+            allowed = min(len(fresh), int(self._tokens)) if self.rate > 0 else len(fresh)
+            if self.rate > 0:
+                self._tokens -= allowed
+            self.suppressed += len(fresh) - allowed
+            # Only commanders that actually beep are held back, rate limited ones may beep when detected again
+            self._start_cooldowns(fresh[:allowed], now)
+            return fresh[:allowed], False
+
+    def _start_cooldowns(self, entries: list[dict], now: float):
+        if self.cooldown <= 0:
+            return
+        expires_at = now + self.cooldown
+        for entry in entries:
+            cmdr_id = entry["commander_id"]
+            self._expires[cmdr_id] = expires_at
+            heapq.heappush(self._heap, (expires_at, cmdr_id))
+
+    def __len__(self) -> int:
+        return len(self._expires)
@@ -0,0 +1,102 @@
+"""Times the handle_event → playback path with the null audio backend.
+
+Reports the cost of handle_event itself, the delay until the first sound of a batch reaches the backend,
+the error on the spacing between sounds of the same batch and the peak number of live threads.
+
+Outside EDMC its `config` module is missing, a stand in exposing `appname` is registered so the plugin modules import.
+
+    python benchmarks/bench_audio_dispatch.py [--batches 20] [--voices 5] [--interval 1.5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import types
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PLUGIN_DIR)
+
+try:
+    import config as _edmc_config  # noqa: F401
+except ImportError:
+    sys.modules["config"] = types.SimpleNamespace(appname="EDMarketConnector")
+
+from beep_beep_config import config  # noqa: E402
+from commander_history import history_inst  # noqa: E402
+from audio_engine import audio_engine  # noqa: E402
+from beep_beep import beep_inst  # noqa: E402
+
+
+def pct(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))] if ordered else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--voices", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=1.5)
+    args = parser.parse_args()
+
+    config.set_config("audio_backend", "null")
+    config.set_config("mute", False)
+    config.set_config("sounds", args.voices)
+    # Every batch replays the same commanders, cooldown and rate limiting would swallow them
+    config.set_config("beep_cooldown", 0)
+    config.set_config("beep_rate", 0)
+    config.set_config("burst_threshold", 0)
+
+    entries = []
+    for i in range(args.voices):
+        cmdr_id = str(900_000 + i)
+        info = {"commander_id": cmdr_id, "name": f"bench{i}", "sound": "neutral", "last_seen": 1704067200}
+        history_inst.seen_data[cmdr_id] = info
+        entries.append(info)
+
+    backend = audio_engine.backend
+    audio_engine.warm()
+
+    dispatch_starts = []
+    handle_costs = []
+    peak_threads = threading.active_count()
+
+    for _ in range(args.batches):
+        start = time.perf_counter()
+        beep_inst.handle_event(entries)
+        handle_costs.append(time.perf_counter() - start)
+        dispatch_starts.append(start)
+
+        deadline = start + args.interval
+        while time.perf_counter() < deadline:
+            peak_threads = max(peak_threads, threading.active_count())
+            time.sleep(0.005)
+
+    time.sleep(0.5)
+    events = sorted(e[0] for e in backend.events)
+
+    first_delays = []
+    spacing_errors = []
+    spacing = getattr(beep_inst, "spacing", 0.2)
+    bounds = dispatch_starts[1:] + [float("inf")]
+    for start, end in zip(dispatch_starts, bounds):
+        batch = [t for t in events if start <= t < end]
+        if not batch:
+            continue
+        first_delays.append(batch[0] - start)
+        spacing_errors.extend(abs((b - a) - spacing) for a, b in zip(batch, batch[1:]))
+
+    print(f"batches={args.batches} voices={args.voices} backend events={len(events)}")
+    print(f"handle_event    mean {statistics.mean(handle_costs) * 1e6:8.1f} us   p95 {pct(handle_costs, 0.95) * 1e6:8.1f} us")
+    if first_delays:
+        print(f"first sound     mean {statistics.mean(first_delays) * 1e3:8.2f} ms   p95 {pct(first_delays, 0.95) * 1e3:8.2f} ms")
+    if spacing_errors:
+        print(f"spacing error   mean {statistics.mean(spacing_errors) * 1e3:8.2f} ms   p95 {pct(spacing_errors, 0.95) * 1e3:8.2f} ms"
+              f"   max {max(spacing_errors) * 1e3:8.2f} ms")
+    print(f"peak threads    {peak_threads}")
+
+
+if __name__ == "__main__":
+    main()
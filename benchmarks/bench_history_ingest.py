@@ -0,0 +1,56 @@
+"""Times the first-run ingest of several cmdrHistory files, one worker against a thread pool.
+
+"largest alone" is the time to read just the biggest file, the floor a parallel ingest could reach.
+
+    python benchmarks/bench_history_ingest.py [--files 4] [--entries 200000] [--workers 1 2 4]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PLUGIN_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_history_stream import write_history  # noqa: E402
+from history_ingest import ingest_latest, read_latest  # noqa: E402
+
+
+def best_of(runs: int, fn) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp, f"Commander{i}.cmdrHistory")
+            # Uneven sizes, the way accounts accumulate history
+            write_history(path, args.entries // (i + 1))
+            paths.append(path)
+        total_mb = sum(os.path.getsize(p) for p in paths) / 1e6
+
+        print(f"{args.files} files, {total_mb:.1f} MB, best of {args.runs}")
+        largest = max(paths, key=os.path.getsize)
+        print(f"  largest alone   {best_of(args.runs, lambda: read_latest(largest)):7.3f} s")
+        for workers in args.workers:
+            seconds = best_of(args.runs, lambda: ingest_latest(paths, workers))
+            print(f"  {workers} worker(s)     {seconds:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Compares json.load against history_stream.iter_interactions on generated cmdrHistory files.
+
+Every measurement runs in its own interpreter so peak RSS is not polluted by earlier runs.
+
+    python benchmarks/bench_history_stream.py [--sizes 1000 10000 100000 1000000]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+from history_stream import iter_interactions
+
+mode, path = sys.argv[2], sys.argv[3]
+
+def peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+base = peak_rss_kb()
+start = time.perf_counter()
+count = 0
+if mode == "json":
+    with open(path, "r", encoding="utf-8") as f:
+        for entry in json.load(f).get("Interactions", []):
+            count += 1
+else:
+    for entry in iter_interactions(path):
+        count += 1
+elapsed = time.perf_counter() - start
+peak = peak_rss_kb()
+print(json.dumps({"count": count, "seconds": elapsed, "base_kb": base, "peak_kb": peak}))
+"""
+
+
+def write_history(path: str, entries: int):
+    rnd = random.Random(entries)
+    flags = (["Met"], ["Met", "WingMember"], ["Met", "Killed"], ["Met", "Friend"])
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"Interactions":[')
+        for i in range(entries):
+            if i:
+                f.write(",")
+            json.dump({
+                "CommanderID": rnd.randrange(1, 10_000_000),
+                "Epoch": 13_300_000_000 + i,
+                "Interactions": rnd.choice(flags),
+            }, f)
+        f.write("]}")
+
+
+def run(mode: str, path: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, PLUGIN_DIR, mode, path],
+        check=True, capture_output=True, text=True
+    )
+    return json.loads(out.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'entries':>10} {'file MB':>8} {'mode':>7} {'seconds':>8} {'peak RSS MB':>12} {'delta MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f"Commander{size}.cmdrHistory")
+            write_history(path, size)
+            file_mb = os.path.getsize(path) / 1e6
+
+            for mode in ("json", "stream"):
+                r = run(mode, path)
+                if r["peak_kb"] is None:
+                    rss = delta = "n/a"
+                else:
+                    rss = f"{r['peak_kb'] / 1024:.1f}"
+                    delta = f"{(r['peak_kb'] - r['base_kb']) / 1024:.1f}"
+                print(f"{size:>10} {file_mb:>8.1f} {mode:>7} {r['seconds']:>8.3f} {rss:>12} {delta:>9}")
+
+
+if __name__ == "__main__":
+    main()
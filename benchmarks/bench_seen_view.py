@@ -0,0 +1,225 @@
+"""Times a history event reaching the Seen Commanders view at 1k, 10k and 100k rows.
+
+"full sort" is the previous sort_rows: re-sort every commander by its last_seen and, with a display,
+one tree.index/tree.move round-trip per item. "sorted index" repositions the changed rows with bisect in
+the three maintained indexes and repaints the virtual table window.
+
+A second table times the filter bar: CommanderModel.match plus putting the matches in sort order, per query,
+with the model load (sorted indexes and name trigrams) and the first search right after it reported cold.
+A third compares the "is this newer than what we have" check of a history scan on ISO text, as last_seen used
+to be stored, with the integer epoch seconds it is now.
+
+Without a display only the model side is timed.
+
+    python benchmarks/bench_seen_view.py [--sizes 1000 10000 100000] [--changed 5] [--events 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import string
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PLUGIN_DIR)
+
+from commander_model import CommanderModel  # noqa: E402
+from sorted_index import SortedIndex  # noqa: E402
+
+FRONTIER_EPOCH_OFFSET = 11644473600
+START = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())
+
+
+def make_seen(n: int) -> dict[str, dict]:
+    return {
+        str(i): {
+            "commander_id": str(i),
+            "name": "".join(random.choices(string.ascii_lowercase + "_", k=random.randint(4, 16))),
+            "sound": random.choice(("neutral", "friend", "foe")),
+            "last_seen": START + random.randrange(10_000_000),
+        }
+        for i in range(n)
+    }
+
+
+def sort_key(seen: dict, field: str):
+    def key(cmdr_id):
+        value = seen[cmdr_id][field]
+        return value.lower() if isinstance(value, str) else value
+    return key
+
+
+def touch(seen: dict, changed: int, now: int) -> list[str]:
+    ids = random.sample(list(seen), changed)
+    for cmdr_id in ids:
+        seen[cmdr_id]["last_seen"] = now
+    return ids
+
+
+def bench(n: int, changed: int, events: int, root) -> tuple[list[float], list[float]]:
+    seen = make_seen(n)
+    now = START + 20_000_000
+
+    tree = table = None
+    if root is not None:
+        from tkinter import ttk
+        from virtual_table import VirtualTable
+        tree = ttk.Treeview(root, columns=("name", "sound", "last_seen"), show="headings")
+        items = {cmdr_id: tree.insert("", "end", values=(info["name"], info["sound"], info["last_seen"]))
+                 for cmdr_id, info in seen.items()}
+        table = VirtualTable(root, ("name", "sound", "last_seen"),
+                             lambda c: (seen[c]["name"], seen[c]["sound"], seen[c]["last_seen"]))
+        table.tree.pack()
+        root.update()
+
+    legacy = []
+    key = sort_key(seen, "last_seen")
+    for _ in range(events):
+        now += 1
+        touch(seen, changed, now)
+        start = time.perf_counter()
+        ordered = sorted(seen, key=key, reverse=True)
+        if tree is not None:
+            for index, cmdr_id in enumerate(ordered):
+                item = items[cmdr_id]
+                if tree.index(item) != index:
+                    tree.move(item, "", index)
+            root.update_idletasks()
+        legacy.append(time.perf_counter() - start)
+
+    if tree is not None:
+        tree.destroy()
+
+    indexes = {}
+    for field in ("name", "sound", "last_seen"):
+        indexes[field] = SortedIndex(sort_key(seen, field))
+        indexes[field].rebuild(list(seen))
+    shown = indexes["last_seen"]
+    shown.reverse = True
+    if table is not None:
+        table.set_rows(shown)
+        root.update()
+
+    current = []
+    for _ in range(events):
+        now += 1
+        ids = touch(seen, changed, now)
+        start = time.perf_counter()
+        for index in indexes.values():
+            for cmdr_id in ids:
+                index.update(cmdr_id)
+        if table is not None:
+            table.render()
+            root.update_idletasks()
+        else:
+            [(seen[c]["name"], seen[c]["sound"], seen[c]["last_seen"]) for c in shown[0:60]]
+        current.append(time.perf_counter() - start)
+
+    if table is not None:
+        table.tree.destroy()
+        table.scrollbar.destroy()
+    return legacy, current
+
+
+def bench_search(n: int, runs: int = 5) -> tuple[float, float, list[tuple[str, int, float]]]:
+    """Model load time, the first (cold) substring search right after it and the best of runs per query."""
+    seen = make_seen(n)
+    model = CommanderModel()
+    start = time.perf_counter()
+    model.load(seen)
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model.ordered("last_seen", False, model.match("abc"))
+    cold = time.perf_counter() - start
+
+    now = START + 7_776_000
+    queries = [
+        ("substring 'abc'", ("abc",)),
+        ("substring 'ab'", ("ab",)),
+        ("prefix '^ab'", ("^ab",)),
+        ("sound foe", ("", "foe")),
+        ("last 7 days", ("", None, now - 7 * 86400, None)),
+        ("'ab' + foe + 30 days", ("ab", "foe", now - 30 * 86400, None)),
+    ]
+    results = []
+    for label, query in queries:
+        best = float("inf")
+        for _ in range(runs):
+            start = time.perf_counter()
+            matches = model.match(*query)
+            model.ordered("last_seen", False, matches)
+            best = min(best, time.perf_counter() - start)
+        results.append((label, len(matches), best))
+    return load, cold, results
+
+
+def bench_scan(n: int, runs: int = 5) -> tuple[float, float]:
+    """Best time for one pass of the scan comparison over n history entries, ISO text then epoch seconds."""
+    seen = make_seen(n)
+    entries = [(cmdr_id, info["last_seen"] + FRONTIER_EPOCH_OFFSET + random.randrange(-60, 60))
+               for cmdr_id, info in seen.items()]
+    seen_iso = {
+        cmdr_id: datetime.fromtimestamp(info["last_seen"], timezone.utc).replace(tzinfo=None).isoformat()
+        for cmdr_id, info in seen.items()
+    }
+    frontier_epoch = datetime(1601, 1, 1)
+
+    iso_best = int_best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        for cmdr_id, epoch in entries:
+            ts = frontier_epoch + timedelta(seconds=epoch)
+            if ts <= datetime.fromisoformat(seen_iso[cmdr_id]):
+                continue
+        iso_best = min(iso_best, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for cmdr_id, epoch in entries:
+            if epoch - FRONTIER_EPOCH_OFFSET <= seen[cmdr_id]["last_seen"]:
+                continue
+        int_best = min(int_best, time.perf_counter() - start)
+    return iso_best, int_best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--changed", type=int, default=5)
+    parser.add_argument("--events", type=int, default=20)
+    args = parser.parse_args()
+    random.seed(1)
+
+    root = None
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.geometry("800x400")
+    except Exception as err:
+        print(f"No display ({err}), timing the model only")
+
+    print(f"{args.changed} changed rows per event, {args.events} events")
+    for n in args.sizes:
+        legacy, current = bench(n, args.changed, args.events, root)
+        print(f"{n:>7} rows   full sort {statistics.median(legacy) * 1e3:9.2f} ms   "
+              f"sorted index {statistics.median(current) * 1e3:7.3f} ms   (median)")
+
+    if root is not None:
+        root.destroy()
+
+    for n in args.sizes:
+        load, cold, results = bench_search(n)
+        print(f"\nfilter at {n} rows   model load {load * 1e3:.0f} ms   first search 'abc' {cold * 1e3:.2f} ms")
+        for label, count, best in results:
+            print(f"  {label:<24} {count:>7} matches {best * 1e3:8.2f} ms")
+
+    print("\nhistory scan comparison (best of 5)")
+    for n in args.sizes:
+        iso, epoch = bench_scan(n)
+        print(f"{n:>7} entries   ISO text {iso * 1e3:8.2f} ms   epoch seconds {epoch * 1e3:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Times SoundLoader.load_sounds on a sounds folder with thousands of custom clips.
+
+Compares the previous listdir/getmtime implementation (kept below for reference), a cold single pass scan
+and a warm start that reuses the persisted index.
+
+Outside EDMC its `config` module is missing, a stand in exposing `appname` is registered so the plugin modules import.
+
+    python benchmarks/bench_sound_loader.py [--files 5000] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import types
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PLUGIN_DIR)
+
+try:
+    import config as _edmc_config  # noqa: F401
+except ImportError:
+    sys.modules["config"] = types.SimpleNamespace(appname="EDMarketConnector")
+
+from sound_loader import SoundLoader  # noqa: E402
+
+
+def legacy_load(sounds_dir: str, default_dir: str) -> dict[str, str]:
+    def newest_match(folder, base_name):
+        if not os.path.isdir(folder):
+            return None
+        candidates = []
+        for f in os.listdir(folder):
+            name, ext = os.path.splitext(f)
+            if name.lower() != base_name or ext.lower() not in (".wav", ".mp3"):
+                continue
+            if os.path.isfile(os.path.join(folder, f)):
+                candidates.append(f)
+        if not candidates:
+            return None
+        candidates.sort(key=lambda f: os.path.getmtime(os.path.join(folder, f)), reverse=True)
+        return candidates[0]
+
+    sound_map = {}
+    for core in SoundLoader.CORE:
+        file = newest_match(sounds_dir, core)
+        if file:
+            sound_map[core] = file
+        else:
+            file = newest_match(default_dir, core)
+            if file:
+                sound_map[core] = os.path.join("default", file)
+
+    for f in os.listdir(sounds_dir):
+        full = os.path.join(sounds_dir, f)
+        if not os.path.isfile(full):
+            continue
+        name, ext = os.path.splitext(f)
+        name = name.lower()
+        if name in sound_map:
+            existing_file = os.path.join(sounds_dir, sound_map[name])
+            if os.path.getmtime(full) > os.path.getmtime(existing_file):
+                sound_map[name] = f
+        elif ext.lower() in (".wav", ".mp3"):
+            sound_map[name] = f
+    sound_map["none"] = "none"
+    return sound_map
+
+
+def timed(fn, runs: int) -> list[float]:
+    results = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        results.append(time.perf_counter() - start)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as plugin_dir:
+        sounds_dir = os.path.join(plugin_dir, "sounds")
+        default_dir = os.path.join(sounds_dir, "default")
+        os.makedirs(default_dir)
+        for core in SoundLoader.CORE:
+            with open(os.path.join(default_dir, f"{core}.wav"), "wb") as f:
+                f.write(b"\0" * 64)
+        for i in range(args.files):
+            ext = ".mp3" if i % 3 == 0 else ".wav"
+            with open(os.path.join(sounds_dir, f"cmdr_{i:06d}{ext}"), "wb") as f:
+                f.write(b"\0" * 64)
+
+        loader = SoundLoader(plugin_dir)
+        assert legacy_load(sounds_dir, default_dir) == loader.sound_map
+
+        rows = [
+            ("legacy listdir", timed(lambda: legacy_load(sounds_dir, default_dir), args.runs)),
+            ("single pass, cold", timed(lambda: loader.load_sounds(force=True), args.runs)),
+            ("persisted index", timed(lambda: SoundLoader(plugin_dir), args.runs)),
+        ]
+
+    print(f"{args.files} clips, {args.runs} runs")
+    for label, results in rows:
+        print(f"{label:<20} mean {statistics.mean(results) * 1e3:8.2f} ms   min {min(results) * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
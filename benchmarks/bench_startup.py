@@ -0,0 +1,137 @@
+"""Times plugin_start3 with a large seen commander store and CommanderHistory backlog.
+
+"blocking" is the previous plugin_start3: load the seen commanders and parse every history file before
+returning to EDMC. "background" hands the same steps to the startup thread, the time until plugin_start3
+returns and the time until the warm-up signals ready are reported separately. A journal event sent right
+after start shows how long it sits in the queue.
+
+Every measurement runs in its own interpreter on a copy of the generated store.
+
+    python benchmarks/bench_startup.py [--seen 100000] [--files 4] [--entries 250000]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PLUGIN_DIR)
+
+CHILD = r"""
+import json, os, sys, time, types
+sys.path.insert(0, sys.argv[1])
+try:
+    import config as _edmc_config  # noqa: F401
+except ImportError:
+    sys.modules["config"] = types.SimpleNamespace(appname="EDMarketConnector")
+
+from commander_history import history_inst
+from persister import persister
+from seen_store import SeenCommanderStore
+from startup import startup
+
+mode, work = sys.argv[2], sys.argv[3]
+history_inst.commander_history_dir = os.path.join(work, "history")
+history_inst.json_file_path = os.path.join(work, "seen_commanders.json")
+history_inst.store = SeenCommanderStore(os.path.join(work, "seen_commanders.db"))
+steps = (history_inst.load_seen_commanders, history_inst.aggregated_commanders_load)
+
+result = {}
+start = time.perf_counter()
+if mode == "blocking":
+    for step in steps:
+        step()
+    result["returned"] = time.perf_counter() - start
+    result["ready"] = result["returned"]
+else:
+    handled = []
+    startup.start(steps, lambda entry: handled.append(time.perf_counter()))
+    result["returned"] = time.perf_counter() - start
+    sent = time.perf_counter()
+    startup.dispatch({"event": "FsdJump"})
+    startup.wait()
+    result["ready"] = time.perf_counter() - start
+    result["queued"] = handled[0] - sent
+
+result["commanders"] = len(history_inst.seen_data)
+persister.stop()
+history_inst.close_store()
+print(json.dumps(result))
+"""
+
+
+def write_store(path: str, commanders: int):
+    from seen_store import SeenCommanderStore
+    rnd = random.Random(commanders)
+    store = SeenCommanderStore(path)
+    store.open()
+    store.upsert(
+        {
+            "commander_id": str(i),
+            "name": f"cmdr{i}",
+            "sound": rnd.choice(("neutral", "friend.wav", "foe")),
+            "last_seen": 1_650_000_000 + rnd.randrange(50_000_000),
+        }
+        for i in range(1, commanders + 1)
+    )
+    store.close()
+
+
+def write_history(path: str, entries: int, commanders: int, seed: int):
+    rnd = random.Random(seed)
+    flags = (["Met"], ["Met", "WingMember"], ["Met", "Killed"], ["Met", "Friend"])
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"Interactions":[')
+        for i in range(entries):
+            if i:
+                f.write(",")
+            json.dump({
+                "CommanderID": rnd.randrange(1, commanders * 2),
+                "Epoch": 13_300_000_000 + rnd.randrange(100_000_000),
+                "Interactions": rnd.choice(flags),
+            }, f)
+        f.write("]}")
+
+
+def run(mode: str, work: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, PLUGIN_DIR, mode, work],
+        check=True, capture_output=True, text=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seen", type=int, default=100_000)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--entries", type=int, default=250_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source")
+        os.makedirs(os.path.join(source, "history"))
+        write_store(os.path.join(source, "seen_commanders.db"), args.seen)
+        for i in range(args.files):
+            write_history(os.path.join(source, "history", f"Commander{i}.cmdrHistory"), args.entries, args.seen, i)
+        history_mb = sum(e.stat().st_size for e in os.scandir(os.path.join(source, "history"))) / 1e6
+
+        print(f"{args.seen} seen commanders, {args.files} history files with {args.entries} entries "
+              f"({history_mb:.1f} MB)")
+        for mode in ("blocking", "background"):
+            work = os.path.join(tmp, mode)
+            shutil.copytree(source, work)
+            r = run(mode, work)
+            line = (f"{mode:>10}   plugin_start3 returns {r['returned'] * 1e3:9.2f} ms   "
+                    f"ready {r['ready']:6.2f} s   {r['commanders']} commanders")
+            if "queued" in r:
+                line += f"   journal event queued {r['queued']:.2f} s"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,31 @@
 import datetime
-import json
 import os
 import re
+import sqlite3
 import threading
 import time
-from typing import Callable, Dict, TypedDict
+from typing import Callable, Dict, Iterable, TypedDict
 from logutil import log
 from beep_beep_config import config
+from history_diff import HistoryDiff
+from history_fingerprint import FingerprintCache
+from history_ingest import ingest_latest
+from history_stream import iter_interactions
+from history_watcher import create_watcher
+from latency import latency
 from location import location
+from persister import persister
+from seen_store import SeenCommanderStore
 
 class CommanderEntry(TypedDict):
     commander_id: str
     name: str
     sound: str
-    last_seen: str
+    # Unix epoch seconds, ISO text only exists in old stores and seen_commanders.json
+    last_seen: int
+
+# Seconds from the CommanderHistory Epoch origin (1601-01-01 UTC) to the Unix epoch
+FRONTIER_EPOCH_OFFSET = 11644473600
 
 CommanderDict = Dict[str, CommanderEntry]  
 
@@ -25,14 +37,20 @@ class CommanderHistoryManager:
             os.getenv("LOCALAPPDATA", ""), "Frontier Developments", "Elite Dangerous", "CommanderHistory"
         )
         self.json_file_path = os.path.join(self.plugin_dir, "seen_commanders.json")
+        self.store = SeenCommanderStore(os.path.join(self.plugin_dir, "seen_commanders.db"))
+        self._dirty: set[str] = set()
+        self._dirty_lock = threading.Lock()
         self.last_modified_timestamp: datetime.datetime = datetime.datetime.min
         self.listeners: list[Callable[[list[CommanderEntry]], None]] = []
         self._gui_listener: Callable[[dict], None] | None = None
         self._sound_listener: Callable[[dict], None] | None = None        
         self.worker_thread: threading.Thread | None = None
         self.worker_stop_event = threading.Event()
+        self.watcher = None
         self.changed = False
-        self.last_data: dict | None = None
+        self.last_written_ns: int | None = None
+        self.history_diff = HistoryDiff()
+        self.fingerprints = FingerprintCache()
         self.data_received = False
         self._trigger = False
         self._reset_timer: threading.Timer | None = None
@@ -64,33 +82,55 @@ class CommanderHistoryManager:
         self._sound_listener = cb
     
     def load_seen_commanders(self):
-        if not os.path.isfile(self.json_file_path) or os.path.getsize(self.json_file_path) == 0:
-            self.seen_data = {}
-            return
-    
         try:
-            with open(self.json_file_path, "r", encoding="utf-8") as f:
-                self.seen_data = json.load(f)
-        except (OSError, json.JSONDecodeError):
-            log.exception("Failed to load seen_commanders.json, starting empty")
+            self.store.open()
+            if self.store.is_empty():
+                migrated = self.store.migrate_json(self.json_file_path)
+                if migrated:
+                    log.info("Migrated %d commanders from seen_commanders.json", migrated)
+            self.seen_data = self.store.load_all()
+        except (OSError, ValueError, sqlite3.Error):
+            log.exception("Failed to load seen commanders, starting empty")
             self.seen_data = {}
-                
+
         for cmdr_id, entry in self.seen_data.items():
             if "sound" in entry:
-                entry["sound"] = os.path.splitext(entry["sound"])[0].lower()      
+                sound = os.path.splitext(entry["sound"])[0].lower()
+                if sound != entry["sound"]:
+                    entry["sound"] = sound
+                    self.mark_dirty(cmdr_id)
+
+    def mark_dirty(self, cmdr_id: str):
+        with self._dirty_lock:
+            self._dirty.add(cmdr_id)
+
+    def set_seen(self, cmdr_id: str, info: CommanderEntry):
+        self.seen_data[cmdr_id] = info
+        self.mark_dirty(cmdr_id)
 
     def save_seen_commanders(self):
-        if self.json_file_path is None:
+        persister.schedule("seen_commanders", self._flush_seen)
+
+    def _flush_seen(self):
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+
+        entries = [dict(self.seen_data[cmdr_id]) for cmdr_id in dirty if cmdr_id in self.seen_data]
+        if not entries:
             return
-    
+
         try:
-            with open(self.json_file_path, "w", encoding="utf-8") as f:
-                json.dump(self.seen_data, f, indent=2)
-        except (OSError, TypeError):
-            log.exception("Failed to save seen_commanders.json")
-            
-    def aggregate_most_recent_commanders(self, first_run=False):
-        self.changed = False
+            self.store.upsert(entries)
+        except sqlite3.Error:
+            log.exception("Failed to save seen commanders")
+            with self._dirty_lock:
+                self._dirty |= dirty
+
+    def close_store(self):
+        self._flush_seen()
+        self.store.close()
+
+    def history_file_mtimes(self) -> dict[str, float] | None:
         try:
             abs_paths = [
                 e.path
@@ -102,100 +142,93 @@ class CommanderHistoryManager:
             log.exception(err)
             return None
 
-    
         if not abs_paths:
             return None
-    
-        file_mtimes = {f: os.path.getmtime(f) for f in abs_paths if os.path.getsize(f) > 0}
-    
-        latest_timestamp = self.last_modified_timestamp
-    
+
+        return {f: os.path.getmtime(f) for f in abs_paths if os.path.getsize(f) > 0}
+
+    def _first_run_entries(self, file_mtimes: dict[str, float]) -> list[dict]:
+        # Parsing holds the GIL, a pool measured slower than reading the files in turn so it is opt-in
+        workers = config.get_config("history_ingest_workers", 1)
+        result = ingest_latest(list(file_mtimes), workers, prepare=self.fingerprints.needs_parse)
+
+        for file_path in result.failed:
+            log.warning("Failed to read %s, skipping", file_path)
+            self.fingerprints.invalidate(file_path)
+
+        for file_path in result.parsed:
+            file_mtime_dt = datetime.datetime.fromtimestamp(file_mtimes[file_path])
+            if file_mtime_dt > self.last_modified_timestamp:
+                self.last_modified_timestamp = file_mtime_dt
+
+        entries = self.history_diff.changes(result.latest.values())
+        self.changed = bool(entries)
+        return entries
+
+    def aggregate_most_recent_commanders(self, first_run=False) -> Iterable[dict] | None:
+        self.changed = False
+        file_mtimes = self.history_file_mtimes()
+        if not file_mtimes:
+            return None
+
         if first_run:
-            files_to_process = abs_paths
-            combined_data = {}
-        
-            for file_path in files_to_process:
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                except (OSError, json.JSONDecodeError):
-                    continue
-        
-                combined_data.update(data)
-        
-                file_mtime_dt = datetime.datetime.fromtimestamp(file_mtimes[file_path])
-                if not latest_timestamp or file_mtime_dt > latest_timestamp:
-                    latest_timestamp = file_mtime_dt
-        
-            if not combined_data:
-                return None
-        
-            data_to_return = combined_data
-    
-        else:
-            files_to_process = [
-                f for f, mtime in file_mtimes.items()
-                if not self.last_modified_timestamp
-                   or (lambda ts: ts is not None and mtime > ts)(getattr(self.last_modified_timestamp, "timestamp", lambda: None)())
-            ]
-            if not files_to_process:
-                return None
-    
-            newest_file = max(files_to_process, key=lambda f: file_mtimes[f])
-    
-            try:
-                with open(newest_file, "r", encoding="utf-8") as f:
-                    data_to_return = json.load(f)
-            except (OSError, json.JSONDecodeError):
-                return None
+            return self._first_run_entries(file_mtimes)
+
+        last_ts = None
+        if self.last_modified_timestamp != datetime.datetime.min:
+            last_ts = self.last_modified_timestamp.timestamp()
+
+        files_to_process = [f for f, mtime in file_mtimes.items() if last_ts is None or mtime > last_ts]
+        if not files_to_process:
+            return None
+
+        newest_file = max(files_to_process, key=lambda f: file_mtimes[f])
+
+        if not self.fingerprints.needs_parse(newest_file):
+            return None
+
+        try:
+            changed_entries = self.history_diff.changes(iter_interactions(newest_file))
+        except (OSError, ValueError):
+            self.fingerprints.invalidate(newest_file)
+            return None
+
+        self.changed = bool(changed_entries)
 
-    
-            latest_timestamp = datetime.datetime.fromtimestamp(file_mtimes[newest_file])
-    
-        if self.last_data != data_to_return:
-            self.changed = True
-            self.last_data = data_to_return
-    
         if not self.changed:
             return None
-    
+
         if self._trigger:
             self.data_received = True
-    
-        self.last_modified_timestamp = latest_timestamp
-        return data_to_return
+
+        self.last_modified_timestamp = datetime.datetime.fromtimestamp(file_mtimes[newest_file])
+        self.last_written_ns = int(file_mtimes[newest_file] * 1e9)
+        return changed_entries
 
     def aggregated_commanders_load(self):
-        data = self.aggregate_most_recent_commanders(True)
-        if data:
-            entries = data.get("Interactions", [])
-            frontier_epoch = datetime.datetime(1601, 1, 1)
-        
+        entries = self.aggregate_most_recent_commanders(True)
+        if entries is not None:
             for entry in entries:
                 interactions = entry.get("Interactions", [])
                 if "Met" not in interactions:
                     continue
         
                 cmdr_id = str(entry["CommanderID"])
-                
-                
-                ts = frontier_epoch + datetime.timedelta(seconds=entry["Epoch"])
+                seen = int(entry["Epoch"]) - FRONTIER_EPOCH_OFFSET
     
                 existing = self.seen_data.get(cmdr_id)
-                if existing:
-                    last_seen_existing = datetime.datetime.fromisoformat(existing["last_seen"])
-                    if ts <= last_seen_existing:
-                        continue
+                if existing and seen <= existing["last_seen"]:
+                    continue
         
          
                 info: CommanderEntry = {
                     "commander_id": cmdr_id,
                     "name": existing.get("name", "unknown") if existing else "unknown",
                     "sound": existing.get("sound", "neutral") if existing else "neutral",
-                    "last_seen": ts.isoformat(),
+                    "last_seen": seen,
                 }
         
-                self.seen_data[cmdr_id] = info
+                self.set_seen(cmdr_id, info)
              
             self.save_seen_commanders()
     
@@ -204,14 +237,13 @@ class CommanderHistoryManager:
     
     
     def aggregated_commanders(self):
-        data = self.aggregate_most_recent_commanders(False)
+        trace = latency.begin()
+        entries = self.aggregate_most_recent_commanders(False)
     
-        if not data:
+        if not entries:
             return
     
-        entries = data.get("Interactions", [])
-    
-        frontier_epoch = datetime.datetime(1601, 1, 1)
+        latency.mark_parsed(trace, self.last_written_ns)
     
         beeps_to_play = []
         changed_entries: list[CommanderEntry] = []
@@ -239,14 +271,12 @@ class CommanderHistoryManager:
                 continue
     
             cmdr_id = str(entry["CommanderID"])
-            ts = frontier_epoch + datetime.timedelta(seconds=entry["Epoch"])
+            seen = int(entry["Epoch"]) - FRONTIER_EPOCH_OFFSET
     
             existing = self.seen_data.get(cmdr_id)
     
-            if existing:
-                last_seen_existing = datetime.datetime.fromisoformat(existing["last_seen"])
-                if ts <= last_seen_existing:
-                    continue
+            if existing and seen <= existing["last_seen"]:
+                continue
                 
                 
             current_flags = set(interactions)
@@ -261,7 +291,7 @@ class CommanderHistoryManager:
                 "commander_id": cmdr_id,
                 "name": existing.get("name", "unknown") if existing else "unknown",
                 "sound": existing.get("sound", "neutral") if existing else "neutral",
-                "last_seen": ts.isoformat(),
+                "last_seen": seen,
             }
  
     
@@ -272,10 +302,12 @@ class CommanderHistoryManager:
             if jump_recent and cmdr_id in location.jump_backup:
                 prev = location.jump_backup[cmdr_id]
                 if prev.get("here", False):
+                    self.history_diff.forget(cmdr_id)
                     continue
     
             if is_wing and wing_recent:
                 beep_this_commander = False
+                self.history_diff.forget(cmdr_id)
                 continue
 
             if inst:
@@ -295,7 +327,7 @@ class CommanderHistoryManager:
                             self.last_interactions[cmdr_id].discard("Killed")                        
                 
                     self.last_interactions[cmdr_id] = current_flags
-                    self.seen_data[cmdr_id] = info
+                    self.set_seen(cmdr_id, info)
                     changed_entries.append(info)
                     continue
 
@@ -341,7 +373,7 @@ class CommanderHistoryManager:
             if allow_beep and beep_this_commander and interdiction_recent == False:
                 beeps_to_play.append(info)
    
-            self.seen_data[cmdr_id] = info
+            self.set_seen(cmdr_id, info)
             changed_entries.append(info)
                             
             self.last_interactions[cmdr_id] = current_flags
@@ -350,7 +382,8 @@ class CommanderHistoryManager:
             return
     
         if beeps_to_play and self._sound_listener:
-            self._sound_listener(beeps_to_play)
+            with latency.active(trace):
+                self._sound_listener(beeps_to_play)
     
         if self._gui_listener and changed_entries:
             self._gui_listener(changed_entries)
@@ -399,18 +432,63 @@ class CommanderHistoryManager:
 
     def stop_worker(self):
         self.worker_stop_event.set()
+        if self.watcher:
+            self.watcher.wake()
         if self.worker_thread:
             self.worker_thread.join(timeout=3)
             log.info("Beepbeep worker stopped.")
+        self.log_parse_stats()
+
+    def log_parse_stats(self):
+        stats = self.fingerprints.stats()
+        total = sum(stats.values())
+        log.info(
+            "CommanderHistory parse stats: %d parsed, %d skipped on stat, %d skipped on hash (%.1f%% skipped)",
+            stats["parses"],
+            stats["stat_skips"],
+            stats["hash_skips"],
+            100.0 * (stats["stat_skips"] + stats["hash_skips"]) / total if total else 0.0
+        )
+
+    def _create_watcher(self):
+        backend = config.get_config("history_watcher", "auto")
+        try:
+            watcher = create_watcher([self.commander_history_dir], self.is_cmdr_history_file, backend)
+        except OSError:
+            log.exception("Failed to create CommanderHistory watcher")
+            return None
+
+        log.info("Watching %s using %s backend", self.commander_history_dir, watcher.name)
+        return watcher
 
     def worker_loop(self):
         while not self.worker_stop_event.is_set():
             try:
-                if self.worker_stop_event.wait(1):
+                if not self.watcher or not self.watcher.alive:
+                    if self.watcher:
+                        self.watcher.close()
+                    self.watcher = self._create_watcher()
+                    # stop_worker only wakes a watcher that already existed when it ran
+                    if self.worker_stop_event.is_set():
+                        break
+                    if not self.watcher:
+                        if self.worker_stop_event.wait(1):
+                            break
+                        continue
+                    # Catch up on anything written while no watcher was attached
+                    self.aggregated_commanders()
+
+                changed = self.watcher.wait(self.worker_stop_event)
+                if self.worker_stop_event.is_set():
                     break
-                self.aggregated_commanders()
+                if changed:
+                    self.aggregated_commanders()
             except Exception:
                 log.exception("Exception in CommanderHistoryManager worker loop, continuing")
 
+        if self.watcher:
+            self.watcher.close()
+            self.watcher = None
+
 history_inst = CommanderHistoryManager()
 
@@ -0,0 +1,182 @@
+from typing import Iterable, Mapping
+from seen_store import UNKNOWN_SEEN
+from sorted_index import SortedIndex
+
+UNKNOWN_TIME = UNKNOWN_SEEN
+
+
+class CommanderRow:
+    """Display record of one commander, last_seen is epoch seconds as kept in seen_data."""
+
+    __slots__ = ("cmdr_id", "name", "name_key", "sound", "last_seen")
+
+    def __init__(self, cmdr_id: str, name: str, sound: str, last_seen: int):
+        self.cmdr_id = cmdr_id
+        self.name = name
+        self.name_key = name.lower()
+        self.sound = sound
+        self.last_seen = last_seen
+
+    @classmethod
+    def from_entry(cls, cmdr_id: str, info: Mapping) -> "CommanderRow":
+        return cls(cmdr_id, info.get("name", "unknown"), info.get("sound", "neutral").lower(),
+                   info.get("last_seen", UNKNOWN_TIME))
+
+    def assign(self, info: Mapping) -> bool:
+        name = info.get("name", "unknown")
+        sound = info.get("sound", "neutral").lower()
+        last_seen = info.get("last_seen", UNKNOWN_TIME)
+        if (name, sound, last_seen) == (self.name, self.sound, self.last_seen):
+            return False
+        self.name = name
+        self.name_key = name.lower()
+        self.sound = sound
+        self.last_seen = last_seen
+        return True
+
+
+class CommanderModel:
+    """Rows of the Seen Commanders view with a sorted index per sort field."""
+
+    SORT_FIELDS = ("name", "sound", "last_seen")
+
+    def __init__(self):
+        self.rows: dict[str, CommanderRow] = {}
+        self.indexes: dict[str, SortedIndex] = {}
+        # Name trigram postings for substring search, built by load() and kept up to date by update()
+        self.grams: dict[str, set[str]] = {}
+
+    @staticmethod
+    def name_grams(name_key: str) -> set[str]:
+        return {name_key[i:i + 3] for i in range(len(name_key) - 2)}
+
+    def _index_name(self, cmdr_id: str, name_key: str, add: bool = True):
+        grams = self.grams
+        for gram in self.name_grams(name_key):
+            if add:
+                grams.setdefault(gram, set()).add(cmdr_id)
+            else:
+                ids = grams.get(gram)
+                if ids is not None:
+                    ids.discard(cmdr_id)
+                    if not ids:
+                        del grams[gram]
+
+    def sort_key(self, field: str):
+        rows = self.rows
+        if field == "name":
+            return lambda cmdr_id: rows[cmdr_id].name_key
+        if field == "sound":
+            return lambda cmdr_id: rows[cmdr_id].sound
+        return lambda cmdr_id: rows[cmdr_id].last_seen
+
+    def load(self, seen_data: Mapping[str, Mapping]):
+        self.rows.clear()
+        self.grams = {}
+        for cmdr_id, info in list(seen_data.items()):
+            row = self.rows[cmdr_id] = CommanderRow.from_entry(cmdr_id, info)
+            self._index_name(cmdr_id, row.name_key)
+
+        cmdr_ids = list(self.rows)
+        self.indexes = {}
+        for field in self.SORT_FIELDS:
+            index = SortedIndex(self.sort_key(field))
+            index.rebuild(cmdr_ids)
+            self.indexes[field] = index
+
+    def get(self, cmdr_id: str) -> CommanderRow | None:
+        return self.rows.get(cmdr_id)
+
+    def update(self, seen_data: Mapping[str, Mapping], cmdr_ids: Iterable[str]) -> set[str]:
+        """Refreshes the given rows from seen_data, returns the sort fields whose order changed."""
+        moved: set[str] = set()
+        for cmdr_id in cmdr_ids:
+            info = seen_data.get(cmdr_id)
+            if info is None:
+                continue
+
+            row = self.rows.get(cmdr_id)
+            if row is None:
+                row = self.rows[cmdr_id] = CommanderRow.from_entry(cmdr_id, info)
+                self._index_name(cmdr_id, row.name_key)
+            else:
+                old_key = row.name_key
+                if not row.assign(info):
+                    continue
+                if row.name_key != old_key:
+                    self._index_name(cmdr_id, old_key, add=False)
+                    self._index_name(cmdr_id, row.name_key)
+
+            for field, index in self.indexes.items():
+                if index.update(cmdr_id):
+                    moved.add(field)
+        return moved
+
+    def sorted_ids(self, field: str, ascending: bool) -> SortedIndex:
+        index = self.indexes.get(field) or self.indexes["last_seen"]
+        index.reverse = not ascending
+        return index
+
+    def match(self, text: str = "", sound: str | None = None,
+              since: int | None = None, until: int | None = None) -> set[str] | None:
+        """Ids matching every given filter, None when no filter is set.
+
+        Text is a name substring, or a prefix when it starts with ^. Prefixes, sounds and last seen ranges
+        are bisected out of the sorted indexes, substrings of three or more characters come from the
+        trigram index and are verified against the name.
+        """
+        text = text.strip().lower()
+        prefix = text.startswith("^")
+        if prefix:
+            text = text[1:]
+        ranged = since is not None or until is not None
+        if not (text or sound or ranged):
+            return None
+
+        rows = self.rows
+        if not text:
+            found = set(self.indexes["sound"].range(sound, sound)) if sound else None
+            if ranged:
+                ids = self.indexes["last_seen"].range(since, until)
+                found = set(ids) if found is None else found.intersection(ids)
+            return found
+
+        # Name matches are usually the most selective, the other filters are checked per candidate row
+        if prefix:
+            candidates = self.indexes["name"].range(text, text + "\uffff")
+            text = ""
+        elif len(text) >= 3:
+            grams = self.grams
+            postings = sorted((grams.get(gram, set()) for gram in self.name_grams(text)), key=len)
+            candidates = postings[0].intersection(*postings[1:])
+        else:
+            candidates = [cmdr_id for cmdr_id, row in rows.items() if text in row.name_key]
+            text = ""
+
+        if not (text or sound or ranged):
+            return set(candidates)
+
+        matches = set()
+        for cmdr_id in candidates:
+            row = rows[cmdr_id]
+            if text and text not in row.name_key:
+                continue
+            if sound and row.sound != sound:
+                continue
+            if since is not None and row.last_seen < since:
+                continue
+            if until is not None and row.last_seen > until:
+                continue
+            matches.add(cmdr_id)
+        return matches
+
+    def ordered(self, field: str, ascending: bool, ids: set[str]) -> list[str]:
+        """ids in the order of the given sort field, the same order the unfiltered view uses."""
+        index = self.sorted_ids(field, ascending)
+        if len(ids) * 8 > len(index):
+            return index.select(ids)
+        key = index.key
+        return sorted(ids, key=lambda cmdr_id: (key(cmdr_id), cmdr_id), reverse=not ascending)
+
+    def __len__(self) -> int:
+        return len(self.rows)
@@ -1,23 +1,37 @@
-from datetime import datetime, timezone
 import tkinter as tk
 from tkinter import ttk
 import tkinter.font as tkFont
 import os
+from collections import deque
+import time
 import myNotebook as nb # noqa
 from beep_beep_config import config
 from commander_history import history_inst
+from commander_model import UNKNOWN_TIME, CommanderModel
+from audio_engine import audio_engine
 from beep_beep import beep_inst
+from latency import latency
+from logutil import log
+from refresh_scheduler import RefreshScheduler
 from sound_loader import sound_inst
+from virtual_table import VirtualTable
 
 class SeenCommandersGUI:
+    # Last seen filter choices as (min age, max age) in seconds
+    SEEN_RANGES = {
+        "Any time": (None, None),
+        "Last hour": (None, 3600),
+        "Last 24 h": (None, 86400),
+        "Last 7 days": (None, 7 * 86400),
+        "Older than 7 days": (7 * 86400, None),
+    }
+
     def __init__(self):
         self.plugin_dir = os.path.dirname(__file__)
-        self.tree_items = {} 
+        self.table = None
+        self.filter_bar = None
+        self.model = CommanderModel()
         self.tree = None 
-        self.name_vars = {}
-        self.last_seen_vars = {}
-        self.widgets = {}
-        self.sound_vars = {}
         self.window = None
         self.parent = None
         self.scrollbar = None
@@ -26,54 +40,98 @@ class SeenCommandersGUI:
         self.row_offset = 0
         self.sort_field = "last_seen"
         self.sort_asc = False       
-        self.refresh_interval = 5000        
+        self.refresh_interval = 1000        
+        self.scheduler = RefreshScheduler()
+        self.search_var = None
+        self.sound_filter = None
+        self.seen_filter = None
+        self.filtering = False
         self.beep_inst = None
         self._refresh_id = None
-        self.ui_cache = {
-            "name": {},
-            "sound": {},
-            "last_seen": {},
-        }        
+        self.max_batch = 500
+        self._pending: deque[list[dict]] = deque()
+        self._pending_ids: dict[str, None] = {}
+        self._built_model: CommanderModel | None = None
+        self._building = False
+        self.poll_interval = 200
+        
 
         
     def on_history_event(self, data):
-        if not self.window or not self.window.winfo_exists():
+        """Runs on the history worker, only queues the entries, the Tk loop picks them up in poll_history()."""
+        self._pending.append(data if isinstance(data, list) else [data])
+    
+    def on_seen_loaded(self):
+        """Runs on the startup thread, builds the model there and leaves it for poll_history() to swap in.
+
+        The model then lives as long as the plugin and is kept current while the window is closed, so
+        opening the window never rebuilds it. Updates queued meanwhile wait until the new model is in.
+        """
+        self._building = True
+        model = CommanderModel()
+        model.load(history_inst.seen_data)
+        self._built_model = model
+        self._building = False
+    
+    def start_polling(self, widget):
+        """Drains queued history updates on widget's after tick, other threads never call into Tk."""
+        def poll():
+            if not widget.winfo_exists():
+                return
+            self.poll_history()
+            widget.after(self.poll_interval, poll)
+    
+        widget.after(self.poll_interval, poll)
+    
+    def poll_history(self):
+        # Read _building first, the startup thread sets _built_model before clearing it
+        building = self._building
+        model = self._built_model
+        view_open = bool(self.table and self.window and self.window.winfo_exists())
+        if model is not None:
+            self._built_model = None
+            self.model = model
+            self.scheduler.clear()
+            if view_open:
+                self.apply_filter()
+        elif building:
             return
     
-        self.window.after(
-            0,
-            lambda: self._handle_history_event(data)
-        )
+        # Later updates of the same commander collapse into one, a long backlog is spread over several ticks
+        while self._pending:
+            for info in self._pending.popleft():
+                self._pending_ids[str(info["commander_id"])] = None
     
+        if not self._pending_ids:
+            return
     
-    def _handle_history_event(self, data):
-        self.add_or_update_commander(data)
-        self.refresh_gui()
+        batch = list(self._pending_ids)[:self.max_batch]
+        for cmdr_id in batch:
+            del self._pending_ids[cmdr_id]
+        if view_open:
+            self.update_rows(batch)
+        else:
+            self.model.update(history_inst.seen_data, batch)
 
 
-    def format_time_ago(self, ts_iso: str) -> str:
-        try:
-            ts = datetime.fromisoformat(ts_iso)
-            if ts.tzinfo is None:
-                ts = ts.replace(tzinfo=timezone.utc)
-            now = datetime.now(timezone.utc)
-            delta = now - ts
-
-            seconds = int(delta.total_seconds())
-            minutes, sec = divmod(seconds, 60)
-            hours, minutes = divmod(minutes, 60)
-            days, hours = divmod(hours, 24)
-
-            if days > 0:
-                return f"{days} d {hours} h ago"
-            if hours > 0:
-                return f"{hours} h {minutes} min ago"
-            if minutes > 0:
-                return f"{minutes} min {sec} s ago"
-            return f"{seconds} s ago"
-        
-        except (ValueError, TypeError):
-            return ts_iso            
+    @staticmethod
+    def format_age(last_seen: int, now: int) -> tuple[str, int]:
+        """Humanized age and the epoch at which that label next changes."""
+        seconds = max(0, now - last_seen)
+        minutes, sec = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        days, hours = divmod(hours, 24)
+
+        if days > 0:
+            label, step = f"{days} d {hours} h ago", 3600
+        elif hours > 0:
+            label, step = f"{hours} h {minutes} min ago", 60
+        elif minutes > 0:
+            label, step = f"{minutes} min {sec} s ago", 1
+        else:
+            label, step = f"{seconds} s ago", 1
+
+        return label, last_seen + (seconds // step + 1) * step
 
     
 
@@ -112,6 +170,7 @@ class SeenCommandersGUI:
         mute_btn.pack(side="left", padx=(4, 0))
         update_mute_button(muted)
     
+        self.start_polling(container)
         return container
 
 
@@ -197,11 +256,15 @@ class SeenCommandersGUI:
         def on_window_close():
             self.save_window_geometry()
             self.window.destroy()
+            self.window = None
     
         self.window.protocol("WM_DELETE_WINDOW", on_window_close)        
 
 
     def save_window_geometry(self):
+        if not self.window or not self.window.winfo_exists():
+            return
+    
         width = max(100, self.window.winfo_width())
         height = max(100, self.window.winfo_height())
         x = self.window.winfo_x()
@@ -226,7 +289,7 @@ class SeenCommandersGUI:
             return
     
         row_id = selection[0]
-        cmdr_id = next((k for k, v in self.tree_items.items() if v == row_id), None)
+        cmdr_id = self.table.row_for_item(row_id)
         if not cmdr_id:
             return
     
@@ -255,14 +318,16 @@ class SeenCommandersGUI:
         if not row_id:
             return
     
-        cmdr_id = next((k for k, v in self.tree_items.items() if v == row_id), None)
+        cmdr_id = self.table.row_for_item(row_id)
         if not cmdr_id:
             return
     
-        info = history_inst.seen_data[cmdr_id]
+        row = self.model.get(cmdr_id)
+        if not row:
+            return
     
         popup = tk.Toplevel(self.window)
-        popup.title(f"Edit Commander {info.get('name', 'unknown')}")
+        popup.title(f"Edit Commander {row.name}")
         popup.geometry(f"+{event.x_root}+{event.y_root}")
         popup.grab_set()
 
@@ -270,7 +335,7 @@ class SeenCommandersGUI:
     
     
         tk.Label(popup, text="Name:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        name_var = tk.StringVar(value=info.get("name", "unknown"))
+        name_var = tk.StringVar(value=row.name)
         name_entry = tk.Entry(popup, textvariable=name_var)
         name_entry.grid(row=0, column=1, padx=5, pady=5)
         name_entry.focus_set()
@@ -279,8 +344,7 @@ class SeenCommandersGUI:
 
         tk.Label(popup, text="Sound:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
         
-        sound_key = info.get("sound", "neutral").lower()
-        sound_var = tk.StringVar(value=sound_key.capitalize())
+        sound_var = tk.StringVar(value=row.sound.capitalize())
         
         combo = ttk.Combobox(
             popup,
@@ -302,20 +366,12 @@ class SeenCommandersGUI:
             new_name = name_var.get()
             new_sound = sound_var.get().lower() 
         
-            self.name_vars[cmdr_id].set(new_name)
-            self.sound_vars[cmdr_id].set(new_sound)
-
             history_inst.seen_data[cmdr_id]["name"] = new_name
             history_inst.seen_data[cmdr_id]["sound"] = new_sound
+            history_inst.mark_dirty(cmdr_id)
             
-            self.tree.set(row_id, "name", new_name)
-            self.tree.set(row_id, "sound", new_sound.capitalize())
-        
             history_inst.save_seen_commanders()
-        
-            sort_field = config.get_config("sort_field", "last_seen")
-            sort_asc = config.get_config("sort_asc", False)
-            self.sort_rows(sort_field, sort_asc)
+            self.update_rows([cmdr_id])
         
             popup.destroy()
   
@@ -335,11 +391,12 @@ class SeenCommandersGUI:
         combo.bind("<Return>", on_combo_enter)
 
     def build_ui(self, parent):
-        sort_field = config.get_config("sort_field", "last_seen")
-        sort_asc = config.get_config("sort_asc", False)
+        snapshot = config.snapshot
+        sort_field = snapshot.get("sort_field", "last_seen")
+        sort_asc = snapshot.get("sort_asc", False)
     
         if not hasattr(self, "tree") or not self.tree or not self.tree.winfo_exists() or self.tree.master != parent:
-            for attr in ["scrollbar", "tree"]:
+            for attr in ["filter_bar", "scrollbar", "tree"]:
                 if hasattr(self, attr) and getattr(self, attr) and getattr(self, attr).winfo_exists():
                     getattr(self, attr).destroy()
                     
@@ -348,7 +405,8 @@ class SeenCommandersGUI:
             row_height = default_font.metrics("linespace") + 4
             style.configure("Treeview", rowheight=row_height)
     
-            self.tree = ttk.Treeview(parent, columns=("name", "sound", "last_seen"), show="headings")
+            self.table = VirtualTable(parent, ("name", "sound", "last_seen"), self.row_values, row_height=row_height)
+            self.tree = self.table.tree
             self.tree.grid(row=1, column=0, columnspan=3, sticky="nsew")
             
             self.tree.heading("name", text="Name", anchor="w", command=lambda: self.on_header_click("name"))
@@ -359,24 +417,15 @@ class SeenCommandersGUI:
             self.tree.column("sound", anchor="w")
             self.tree.column("last_seen", anchor="w")
             
-            self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.tree.yview)
-            self.tree.configure(yscroll=self.scrollbar.set)
+            self.scrollbar = self.table.scrollbar
             self.scrollbar.grid(row=1, column=3, sticky="ns")
     
             parent.grid_rowconfigure(1, weight=1)
             for col in range(3):
                 parent.grid_columnconfigure(col, weight=1)
     
-            self.widgets.clear()
-            self.sound_vars.clear()
-            self.name_vars.clear()
-            self.last_seen_vars.clear()
-            self.tree_items = {}
-
-        if history_inst.seen_data:
-            new_ids = [cmdr_id for cmdr_id in history_inst.seen_data if cmdr_id not in self.tree_items]
-            if new_ids:
-                self.add_rows(new_ids)
+            self.scheduler.clear()
+            self.build_filter_bar(parent)
     
         self.sort_rows(sort_field, sort_asc)
         
@@ -422,139 +471,114 @@ class SeenCommandersGUI:
     
         self.sort_rows(self.sort_field, self.sort_asc)
     
-    def add_rows(self, cmdr_ids: list[str]):
-        if not hasattr(self, "tree_items"):
-            self.tree_items = {}
-        if not hasattr(self, "widgets"):
-            self.widgets = {}
-    
-        sort_field = getattr(self, "sort_field", "last_seen")
-        sort_asc = getattr(self, "sort_asc", False)
-    
-        def sort_key(cmdr_id):
-            if sort_field == "name":
-                return self.name_vars[cmdr_id].get().lower()
-            if sort_field == "sound":
-                return self.sound_vars[cmdr_id].get().lower()
-            if sort_field == "last_seen":
-                try:
-                    ts = datetime.fromisoformat(history_inst.seen_data[cmdr_id].get("last_seen", ""))
-                    if ts.tzinfo is None:
-                        ts = ts.replace(tzinfo=timezone.utc)
-                    return ts
-                except Exception:
-                    return datetime(1, 1, 1, tzinfo=timezone.utc)
-            return cmdr_id
-    
-        all_ids = list(history_inst.seen_data.keys())
-        sorted_ids = sorted(all_ids, key=sort_key, reverse=not sort_asc)
-    
-        for cmdr_id in cmdr_ids:
-            info = history_inst.seen_data[cmdr_id]
-    
-            self.name_vars.setdefault(cmdr_id, tk.StringVar(value=info.get("name", "unknown")))
-            if cmdr_id not in self.sound_vars:
+    def row_values(self, cmdr_id: str) -> tuple:
+        row = self.model.get(cmdr_id)
+        if not row:
+            return ("unknown", "Neutral", "")
+        sound_key = row.sound if row.sound in sound_inst.sound_map else "neutral"
+        if row.last_seen == UNKNOWN_TIME:
+            return (row.name, sound_key.capitalize(), "")
+    
+        # Rows are scheduled as they are paged in, rows paged out are dropped once their bucket is due
+        label, due = self.format_age(row.last_seen, int(time.time()))
+        self.scheduler.schedule(cmdr_id, due)
+        return (row.name, sound_key.capitalize(), label)
 
-                sound_key = info.get("sound", "neutral").lower()
-                if sound_key not in sound_inst.sound_files:
-                    sound_key = "neutral"
-                
-                self.sound_vars[cmdr_id] = tk.StringVar(value=sound_key)
-
-
-            self.last_seen_vars.setdefault(cmdr_id, tk.StringVar(value=self.format_time_ago(info.get("last_seen"))))
-    
-            index = 0
-            for sid in sorted_ids:
-                if sid == cmdr_id:
-                    break
-                if sid in self.tree_items:
-                    index += 1
-    
-            item = self.tree.insert("", index, values=(
-                self.name_vars[cmdr_id].get(),
-                self.sound_vars[cmdr_id].get().capitalize(),
-                self.last_seen_vars[cmdr_id].get()
-            ))
-            self.tree_items[cmdr_id] = item
-            self.widgets[cmdr_id] = {}
-
-    def add_or_update_commander(self, data):
-        if not isinstance(data, list):
-            data = [data]
-    
-        new_cmdr_ids = []
-    
-        for info in data:
-            cmdr_id = info["commander_id"]
-            cmdr_id_str = str(cmdr_id)
-    
-            self.name_vars.setdefault(cmdr_id_str, tk.StringVar()).set(info.get("name", "unknown"))
-            self.sound_vars.setdefault(cmdr_id_str, tk.StringVar()).set(info.get("sound", sound_inst.neutral).lower())
-            self.last_seen_vars.setdefault(cmdr_id_str, tk.StringVar()).set(self.format_time_ago(info["last_seen"]))
-    
-            item_id = self.tree_items.get(cmdr_id_str)
-            if self.window and self.window.winfo_exists() and hasattr(self, 'tree') and self.tree.winfo_exists():
-                if item_id:
-                    self.tree.set(item_id, "last_seen", self.format_time_ago(info["last_seen"]))
-                    self.tree.set(item_id, "name", info.get("name", "unknown"))
-                    self.tree.set(item_id, "sound", info.get("sound", sound_inst.neutral).capitalize())
-                    
-                else:
-                    new_cmdr_ids.append(cmdr_id_str)
-    
-        if new_cmdr_ids and self.window and self.window.winfo_exists() and hasattr(self, 'tree') and self.tree.winfo_exists():
-            self.add_rows(new_cmdr_ids)
+    def update_rows(self, cmdr_ids: list[str]):
+        """Repositions the changed rows, the table only repaints its window when the shown order moved."""
+        rows = self.table.rows
+        changed = set(cmdr_ids)
+        anchor = None
+        if self.table.top > 0:
+            window = rows[self.table.top:self.table.top + self.table.visible_rows]
+            anchor = next((cmdr_id for cmdr_id in window if cmdr_id not in changed), None)
+    
+        moved = self.model.update(history_inst.seen_data, changed)
+        if not self.filtering and self.sort_field not in moved:
+            for cmdr_id in changed:
+                self.table.refresh_row(cmdr_id)
+            return
     
-        if self.window and self.window.winfo_exists() and hasattr(self, 'tree') and self.tree.winfo_exists():
-            sort_field = config.get_config("sort_field", "last_seen")
-            sort_asc = config.get_config("sort_asc", False)
-            self.sort_rows(sort_field, sort_asc)
+        if self.filtering:
+            # Changed rows may enter or leave the filter
+            rows = self.filtered_rows()
+            self.table.rows = rows
+        try:
+            top = rows.index(anchor) if anchor else self.table.top
+        except ValueError:
+            top = self.table.top
+        self.table.render(top)
        
     def sort_rows(self, sort_field, sort_asc):
-        if not hasattr(self, "tree") or not self.window or not self.window.winfo_exists():
+        if not self.table or not self.window or not self.window.winfo_exists():
             return        
-        
-        def sort_key(cmdr_id):
-            if sort_field == "name":
-                return self.name_vars[cmdr_id].get().lower()
-            if sort_field == "sound":
-                return self.sound_vars[cmdr_id].get().lower()
-            if sort_field == "last_seen":
-                try:
-                    ts = datetime.fromisoformat(history_inst.seen_data[cmdr_id].get("last_seen", ""))
-                    if ts.tzinfo is None:
-                        ts = ts.replace(tzinfo=timezone.utc)
-                    return ts
-                except Exception:
-                    return datetime(1, 1, 1, tzinfo=timezone.utc)
-            return cmdr_id
     
-        sorted_ids = sorted(history_inst.seen_data.keys(), key=sort_key, reverse=not sort_asc)
+        self.sort_field = sort_field if sort_field in self.model.indexes else "last_seen"
+        self.sort_asc = sort_asc
+        self.table.set_rows(self.filtered_rows())
     
-        for index, cmdr_id in enumerate(sorted_ids):
-            item_id = self.tree_items.get(cmdr_id)
-            if not item_id:
-                continue
-            current_index = self.tree.index(item_id)
-            if current_index != index:
-                self.tree.move(item_id, "", index)
+    def build_filter_bar(self, parent):
+        self.filter_bar = tk.Frame(parent)
+        self.filter_bar.grid(row=0, column=0, columnspan=4, sticky="ew", pady=(5, 2))
+        self.filter_bar.grid_columnconfigure(1, weight=1)
     
-    def refresh_gui(self):
-        if not self.tree or not self.tree.winfo_exists():
-            return
+        self.search_var = tk.StringVar()
+        self.sound_filter = tk.StringVar(value="Any")
+        self.seen_filter = tk.StringVar(value="Any time")
     
-        for cmdr_id, data in history_inst.seen_data.items():
-            item_id = self.tree_items.get(cmdr_id)
+        tk.Label(self.filter_bar, text="Search").grid(row=0, column=0, padx=(5, 2))
+        tk.Entry(self.filter_bar, textvariable=self.search_var).grid(row=0, column=1, padx=2, sticky="ew")
     
-            if not item_id:
-                continue
+        sound_combo = ttk.Combobox(self.filter_bar, textvariable=self.sound_filter, width=12, state="readonly")
+        sound_combo.configure(
+            values=["Any"],
+            postcommand=lambda: sound_combo.configure(
+                values=["Any"] + [s.capitalize() for s in sound_inst.sound_files if s != "none"]
+            )
+        )
+        sound_combo.grid(row=0, column=2, padx=2)
     
-            try:
-                new_time = self.format_time_ago(data["last_seen"])
-                self.tree.set(item_id, "last_seen", new_time)
-            except Exception:
-                pass
+        ttk.Combobox(
+            self.filter_bar,
+            textvariable=self.seen_filter,
+            values=list(self.SEEN_RANGES),
+            width=16,
+            state="readonly"
+        ).grid(row=0, column=3, padx=(2, 5))
+    
+        for var in (self.search_var, self.sound_filter, self.seen_filter):
+            var.trace_add("write", lambda *_: self.apply_filter())
+    
+        parent.grid_rowconfigure(0, weight=0)
+    
+    def filtered_rows(self):
+        """Rows to show in the current sort order, the full sorted index when no filter is set."""
+        text = self.search_var.get() if self.search_var else ""
+        sound = self.sound_filter.get() if self.sound_filter else "Any"
+        min_age, max_age = self.SEEN_RANGES.get(self.seen_filter.get() if self.seen_filter else "", (None, None))
+        now = int(time.time())
+    
+        matches = self.model.match(
+            text,
+            None if sound == "Any" else sound.lower(),
+            now - max_age if max_age is not None else None,
+            now - min_age if min_age is not None else None
+        )
+        self.filtering = matches is not None
+        if matches is None:
+            return self.model.sorted_ids(self.sort_field, self.sort_asc)
+        return self.model.ordered(self.sort_field, self.sort_asc, matches)
+    
+    def apply_filter(self):
+        if self.table and self.tree.winfo_exists():
+            self.table.set_rows(self.filtered_rows(), 0)
+    
+    def refresh_gui(self):
+        if not self.table or not self.tree.winfo_exists():
+            return
+    
+        for cmdr_id in self.scheduler.pop_due(int(time.time())):
+            self.table.refresh_row(cmdr_id)
 
 
     def start_auto_refresh(self):
@@ -636,6 +660,18 @@ class SeenCommandersGUI:
 
         popup.geometry(f"{width}x{height}+{x}+{y}")
         
+    def export_latency(self):
+        path = os.path.join(self.plugin_dir, "latency_stats.json")
+        try:
+            latency.export(path)
+            log.info("Latency stats exported to %s", path)
+        except (OSError, TypeError, ValueError):
+            log.exception("Failed to export latency stats")
+    
+    def reload_sounds(self):
+        sound_inst.reload()
+        audio_engine.start_warmup(beep_inst.gain)
+    
     def open_sounds_folder(self):
         folder = os.path.join(self.plugin_dir, "sounds")
         os.makedirs(folder, exist_ok=True) 
@@ -675,7 +711,45 @@ class SeenCommandersGUI:
 
 
 
-    def add_info_box(self, frame, row, text, *, title="Info", columnspan=2):
+    def add_asset_stats(self, frame, row):
+        box = tk.LabelFrame(frame, text="Sound files", bd=2, relief="groove")
+        box.grid(row=row, column=0, columnspan=2, padx=5, pady=(2, 8), sticky="ew")
+        box.columnconfigure(0, weight=1)
+    
+        columns = ("duration", "format", "rms", "peak", "gain")
+        tree = ttk.Treeview(box, columns=columns, height=6)
+        tree.heading("#0", text="Sound", anchor="w")
+        for col, text in zip(columns, ("Length", "Format", "RMS dBFS", "Peak dBFS", "Gain")):
+            tree.heading(col, text=text, anchor="w")
+            tree.column(col, width=80, anchor="w")
+        tree.grid(row=0, column=0, sticky="ew", padx=(5, 0), pady=5)
+    
+        scrollbar = ttk.Scrollbar(box, orient="vertical", command=tree.yview)
+        tree.configure(yscroll=scrollbar.set)
+        scrollbar.grid(row=0, column=1, sticky="ns", pady=5)
+    
+        def fmt_db(value):
+            return "-" if value is None else f"{value:.1f}"
+    
+        def refresh():
+            tree.delete(*tree.get_children())
+            for name, stats, gain in audio_engine.asset_stats():
+                if stats is None:
+                    tree.insert("", "end", text=name, values=("-", "not analysed", "-", "-", "-"))
+                    continue
+                tree.insert("", "end", text=name, values=(
+                    f"{stats.duration:.2f} s",
+                    f"{stats.frame_rate} Hz {stats.channels} ch",
+                    fmt_db(stats.rms_dbfs),
+                    fmt_db(stats.peak_dbfs),
+                    f"x{gain:.2f}",
+                ))
+    
+        tk.Button(box, text="Refresh", command=refresh).grid(row=1, column=0, padx=5, pady=(0, 5), sticky="w")
+        refresh()
+        return row + 1
+
+    def add_info_box(self, frame, row, text, *, title="Info", columnspan=2, textvariable=None):
         info_frame = tk.LabelFrame(frame, text=title, bd=2, relief="groove")
         info_frame.grid(
             row=row,
@@ -689,6 +763,7 @@ class SeenCommandersGUI:
         label = tk.Label(
             info_frame,
             text=text,
+            textvariable=textvariable,
             justify="left",
             anchor="nw"
         )
@@ -766,7 +841,7 @@ class SeenCommandersGUI:
                 "should not be modified. To override a default sound, simply add a file "
                 "with the same name in the main 'sounds' folder (ext does not matter). "
                 "The plugin automatically loads the newest file for each name. "
-                "Use the 'Reload Sounds' button to update the list immediately."
+                "Added, replaced or deleted files are picked up automatically while EDMC is running."
             ),
             title="Sound Files"
         )
@@ -774,7 +849,7 @@ class SeenCommandersGUI:
         tk.Button(
             frame,
             text="Reload sounds",
-            command=sound_inst.reload
+            command=self.reload_sounds
         ).grid(row=row, column=1, padx=5, sticky="e")
         
         row += 1
@@ -783,9 +858,8 @@ class SeenCommandersGUI:
             frame,
             row,
             (
-                "Click the 'Reload Sounds' button to re-scan the 'sounds' folder "
-                "and update available sound files. This allows you to add new sounds "
-                "or replace existing ones without restarting EDMC."
+                "Click the 'Reload Sounds' button to force a full re-scan of the 'sounds' folder, "
+                "for example if a change was not picked up automatically."
             ),
             title="Reload Sounds"
         )
@@ -804,10 +878,92 @@ class SeenCommandersGUI:
             frame,
             row,
             (
-                "If there are multiple CMDRS, it will play each one with a 200 ms delay."
+                "If there are multiple CMDRS, their sounds are mixed and played together, "
+                "up to this many at once. MP3 sounds cannot be mixed and play one after another "
+                "with a 200 ms delay."
             ),
             title="Multiple sounds"
         )
+    
+        row = self.add_checkbox(
+            frame,
+            row,
+            "Normalize loudness",
+            tk.BooleanVar(value=config.get_config("normalize_sounds", False)),
+            attr="normalize_sounds"
+        )
+    
+        row = self.add_info_box(
+            frame,
+            row,
+            (
+                "When enabled, every WAV sound is brought to a similar loudness so quiet and loud "
+                "files play at about the same level. MP3 sounds are played unchanged."
+            ),
+            title="Normalize loudness"
+        )
+    
+        row = self.add_asset_stats(frame, row)
+    
+        row = self.add_slider(
+            frame,
+            row,
+            "Beep cooldown (s)",
+            tk.IntVar(value=config.get_config("beep_cooldown", 5)),
+            from_=0,
+            to=60,
+            attr="beep_cooldown"
+        )
+    
+        row = self.add_info_box(
+            frame,
+            row,
+            (
+                "A CMDR will not beep again until this many seconds have passed since their last beep."
+            ),
+            title="Beep cooldown"
+        )
+    
+        row = self.add_slider(
+            frame,
+            row,
+            "Burst threshold",
+            tk.IntVar(value=config.get_config("burst_threshold", 5)),
+            from_=0,
+            to=20,
+            attr="burst_threshold"
+        )
+    
+        row = self.add_info_box(
+            frame,
+            row,
+            (
+                "When at least this many CMDRS arrive at once, a single cue is played instead of one "
+                "sound per CMDR. The cue is the most severe sound among them: foe, then neutral, then friend. "
+                "0 turns this off."
+            ),
+            title="Burst threshold"
+        )
+    
+        row = self.add_slider(
+            frame,
+            row,
+            "Beep rate limit",
+            tk.IntVar(value=config.get_config("beep_rate", 6)),
+            from_=0,
+            to=30,
+            attr="beep_rate"
+        )
+    
+        row = self.add_info_box(
+            frame,
+            row,
+            (
+                f"At most this many beeps are played within {config.get_config('beep_rate_window', 10):g} seconds, "
+                "further CMDRS stay silent until they are detected again. 0 means no limit."
+            ),
+            title="Beep rate limit"
+        )
         
         row += 1
         
@@ -847,6 +1003,30 @@ class SeenCommandersGUI:
             title="Wing Notify"
         )
     
+        latency_var = tk.StringVar(value=latency.format_summary())
+    
+        row = self.add_info_box(
+            frame,
+            row,
+            "",
+            title="Detection latency",
+            textvariable=latency_var
+        )
+    
+        tk.Button(
+            frame,
+            text="Refresh",
+            command=lambda: latency_var.set(latency.format_summary())
+        ).grid(row=row, column=0, padx=5, sticky="w")
+    
+        tk.Button(
+            frame,
+            text="Export latency",
+            command=self.export_latency
+        ).grid(row=row, column=1, padx=5, sticky="e")
+    
+        row += 1
+    
         row = self.add_info_box(
             frame,
             row,
@@ -0,0 +1,55 @@
+from typing import Iterable
+
+
+class HistoryDiff:
+    """Remembers (Epoch, Interactions) per CommanderID and only lets new or changed entries through.
+
+    Entries older than the remembered Epoch are dropped, so the snapshot always holds the latest state.
+    """
+
+    def __init__(self):
+        self._snapshot: dict[str, tuple[int, tuple[str, ...]]] = {}
+
+    @staticmethod
+    def entry_key(entry: dict) -> tuple[str, tuple[int, tuple[str, ...]]] | None:
+        try:
+            return str(entry["CommanderID"]), (entry["Epoch"], tuple(entry.get("Interactions", ())))
+        except (KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def is_stale(known: tuple[int, tuple[str, ...]] | None, state: tuple[int, tuple[str, ...]]) -> bool:
+        return known is not None and (known == state or state[0] < known[0])
+
+    def changes(self, entries: Iterable[dict]) -> list[dict]:
+        # Only commits the snapshot once the whole input was consumed, a parse error midway leaves it untouched
+        snapshot = self._snapshot
+        pending: dict[str, tuple[int, tuple[str, ...]]] = {}
+        changed = []
+        for entry in entries:
+            key = self.entry_key(entry)
+            if key is None:
+                continue
+
+            cmdr_id, state = key
+            if self.is_stale(pending.get(cmdr_id, snapshot.get(cmdr_id)), state):
+                continue
+
+            pending[cmdr_id] = state
+            changed.append(entry)
+
+        snapshot.update(pending)
+        return changed
+
+    def forget(self, cmdr_id: str):
+        # The entry will be reported again on the next snapshot even if it did not change
+        self._snapshot.pop(cmdr_id, None)
+
+    def clear(self):
+        self._snapshot.clear()
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    def __contains__(self, cmdr_id: str) -> bool:
+        return cmdr_id in self._snapshot
@@ -0,0 +1,69 @@
+import hashlib
+import mmap
+import os
+import threading
+
+
+class FingerprintCache:
+    """Per file (inode, size, mtime_ns) plus content hash, used to skip parsing files whose bytes did not change.
+
+    Safe to call from the first-run ingest workers, hashing runs outside the lock.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, tuple[tuple[int, int, int], bytes]] = {}
+        self._lock = threading.Lock()
+        self.stat_skips = 0
+        self.hash_skips = 0
+        self.parses = 0
+
+    @staticmethod
+    def digest(path: str, size: int) -> bytes:
+        if size == 0:
+            return b""
+
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.blake2b(mm, digest_size=16).digest()
+
+    def needs_parse(self, path: str) -> bool:
+        try:
+            st = os.stat(path)
+            sig = (st.st_ino, st.st_size, st.st_mtime_ns)
+            cached = self._entries.get(path)
+            if cached and cached[0] == sig:
+                with self._lock:
+                    self.stat_skips += 1
+                return False
+
+            digest = self.digest(path, st.st_size)
+        except (OSError, ValueError):
+            with self._lock:
+                self._entries.pop(path, None)
+                self.parses += 1
+            return True
+
+        with self._lock:
+            self._entries[path] = (sig, digest)
+            if cached and cached[1] == digest:
+                self.hash_skips += 1
+                return False
+
+            self.parses += 1
+        return True
+
+    def invalidate(self, path: str):
+        # Called when parsing failed so the same bytes are retried next time
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "stat_skips": self.stat_skips,
+            "hash_skips": self.hash_skips,
+            "parses": self.parses,
+        }
@@ -0,0 +1,82 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, NamedTuple
+from history_stream import iter_interactions
+
+
+class IngestResult(NamedTuple):
+    latest: dict
+    parsed: list[str]
+    failed: list[str]
+
+
+def keep_latest(entries: Iterable[dict], latest: dict | None = None) -> dict:
+    """Keeps the entry with the highest Epoch per CommanderID, later entries win ties.
+
+    Keyed by the CommanderID as found in the file, converting every id to str would dominate the loop.
+    """
+    latest = {} if latest is None else latest
+    get = latest.get
+    for entry in entries:
+        try:
+            cmdr_id = entry["CommanderID"]
+            epoch = entry["Epoch"]
+            current = get(cmdr_id)
+            if current is None or epoch >= current["Epoch"]:
+                latest[cmdr_id] = entry
+        except (KeyError, TypeError):
+            continue
+    return latest
+
+
+def read_latest(path: str) -> tuple[dict, bool]:
+    """Latest entry per commander in one file and whether the whole file was readable.
+
+    A malformed or truncated file still returns the entries read before the error.
+    """
+    latest: dict = {}
+    try:
+        keep_latest(iter_interactions(path), latest)
+    except (OSError, ValueError):
+        return latest, False
+    return latest, True
+
+
+def ingest_latest(paths: list[str], workers: int = 1,
+                  prepare: Callable[[str], object] | None = None) -> IngestResult:
+    """Parses every file, in turn or on a thread pool, and merges them into the latest entry per commander.
+
+    Each file is reduced to one entry per commander on its worker, so the merge only touches those. The
+    largest files are submitted first so a big file does not start last. prepare runs on the worker just
+    before its file is parsed.
+    """
+    def work(path: str) -> tuple[dict, bool]:
+        if prepare:
+            prepare(path)
+        return read_latest(path)
+
+    ordered = sorted(paths, key=_size, reverse=True)
+    workers = max(1, min(workers, len(ordered)))
+    if workers == 1:
+        results = map(work, ordered)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="BeepBeepIngest") as pool:
+            results = list(pool.map(work, ordered))
+
+    merged: dict = {}
+    parsed: list[str] = []
+    failed: list[str] = []
+    for path, (latest, ok) in zip(ordered, results):
+        (parsed if ok else failed).append(path)
+        if not merged:
+            merged = latest
+        else:
+            keep_latest(latest.values(), merged)
+    return IngestResult(merged, parsed, failed)
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
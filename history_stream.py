@@ -0,0 +1,105 @@
+import json
+from typing import Iterator, TextIO
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _ChunkReader:
+    def __init__(self, f: TextIO, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+
+        data = self.f.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            buf = self.buf
+            pos = self.pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+
+            # A number ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self.buf) and self.fill():
+                continue
+
+            self.pos = end
+            return obj
+
+
+def iter_interactions(path: str, chunk_size: int = 64 * 1024) -> Iterator[dict]:
+    """Yields the entries of the top level "Interactions" array one at a time.
+
+    Only one chunk and one entry are held in memory, so peak usage does not depend on the file size.
+    Raises ValueError (json.JSONDecodeError) on malformed or truncated files, after yielding what was readable.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _ChunkReader(f, chunk_size)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+
+        while True:
+            key = reader.value()
+            reader.expect(":")
+
+            if key == "Interactions" and reader.peek() == "[":
+                reader.expect("[")
+                if reader.peek() == "]":
+                    reader.pos += 1
+                else:
+                    while True:
+                        entry = reader.value()
+                        if isinstance(entry, dict):
+                            yield entry
+
+                        sep = reader.peek()
+                        reader.pos += 1
+                        if sep == "]":
+                            break
+                        if sep != ",":
+                            raise ValueError(f"Unexpected {sep!r} in Interactions array")
+            else:
+                reader.value()
+
+            sep = reader.peek()
+            reader.pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"Unexpected {sep!r} in cmdrHistory object")
@@ -0,0 +1,310 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Callable, Iterable
+
+
+class PollingWatcher:
+    """Stat based fallback, reports files whose (mtime_ns, size) changed or that disappeared since the last pass."""
+
+    name = "poll"
+
+    def __init__(self, folders: Iterable[str], match: Callable[[str], bool], interval: float = 1.0):
+        self.folders = list(folders)
+        self.match = match
+        self.interval = interval
+        self.alive = True
+        self._wake = threading.Event()
+        self._state = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        state: dict[str, tuple[int, int]] = {}
+        for folder in self.folders:
+            try:
+                with os.scandir(folder) as it:
+                    for e in it:
+                        if not self.match(e.name) or not e.is_file():
+                            continue
+                        st = e.stat()
+                        state[e.path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                continue
+        return state
+
+    def _changes(self) -> set[str]:
+        current = self._scan()
+        changed = {path for path, sig in current.items() if self._state.get(path) != sig}
+        changed.update(self._state.keys() - current.keys())
+        self._state = current
+        return changed
+
+    def wait(self, stop_event: threading.Event) -> set[str]:
+        if stop_event.is_set():
+            return set()
+        self._wake.wait(self.interval)
+        self._wake.clear()
+        if stop_event.is_set():
+            return set()
+        return self._changes()
+
+    def wake(self):
+        self._wake.set()
+
+    def close(self):
+        self.alive = False
+        self._wake.set()
+
+
+class InotifyWatcher:
+    """Linux inotify backend, blocks until a matching file is closed after writing, renamed or deleted."""
+
+    name = "inotify"
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_IGNORED = 0x00008000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, folders: Iterable[str], match: Callable[[str], bool], interval: float = 1.0):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._libc.inotify_init1.argtypes = [ctypes.c_int]
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+
+        self.match = match
+        self.alive = True
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+        self._wake_r, self._wake_w = os.pipe()
+        self._dirs: dict[int, str] = {}
+
+        mask = (self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_MOVED_FROM | self.IN_DELETE
+                | self.IN_DELETE_SELF | self.IN_MOVE_SELF)
+        try:
+            for folder in folders:
+                wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), mask)
+                if wd < 0:
+                    err = ctypes.get_errno()
+                    raise OSError(err, os.strerror(err), folder)
+                self._dirs[wd] = folder
+        except OSError:
+            self.close()
+            raise
+
+    def wait(self, stop_event: threading.Event) -> set[str]:
+        changed: set[str] = set()
+        # A stop that landed before this watcher existed never reached wake()
+        if not self.alive or stop_event.is_set():
+            return changed
+
+        try:
+            readable, _, _ = select.select([self._fd, self._wake_r], [], [])
+        except (OSError, ValueError):
+            self.alive = False
+            return changed
+
+        if self._wake_r in readable:
+            try:
+                os.read(self._wake_r, 512)
+            except OSError:
+                pass
+
+        if stop_event.is_set() or self._fd not in readable:
+            return changed
+
+        try:
+            buf = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        except OSError:
+            self.alive = False
+            return changed
+
+        offset = 0
+        while offset + self._EVENT.size <= len(buf):
+            wd, mask, _cookie, length = self._EVENT.unpack_from(buf, offset)
+            offset += self._EVENT.size
+            raw_name = buf[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & (self.IN_IGNORED | self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                # Watched directory went away, let the owner rebuild the watcher
+                self.alive = False
+                continue
+
+            folder = self._dirs.get(wd)
+            name = os.fsdecode(raw_name)
+            if folder and name and self.match(name):
+                changed.add(os.path.join(folder, name))
+
+        return changed
+
+    def wake(self):
+        try:
+            os.write(self._wake_w, b"\0")
+        except OSError:
+            pass
+
+    def close(self):
+        self.alive = False
+        for fd in (getattr(self, "_fd", -1), getattr(self, "_wake_w", -1), getattr(self, "_wake_r", -1)):
+            if fd is not None and fd >= 0:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._fd = self._wake_r = self._wake_w = -1
+
+
+class WindowsChangeWatcher(PollingWatcher):
+    """Windows backend, blocks on FindFirstChangeNotificationW handles and only scans once a folder changed.
+
+    The notification does not name the file, the stat pass of the polling backend finds what changed.
+    """
+
+    name = "win32"
+
+    FILE_NOTIFY_CHANGE_FILE_NAME = 0x00000001
+    FILE_NOTIFY_CHANGE_SIZE = 0x00000008
+    FILE_NOTIFY_CHANGE_LAST_WRITE = 0x00000010
+    WAIT_OBJECT_0 = 0x00000000
+    WAIT_FAILED = 0xFFFFFFFF
+    INFINITE = 0xFFFFFFFF
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+    def __init__(self, folders: Iterable[str], match: Callable[[str], bool], interval: float = 1.0):
+        if sys.platform != "win32":
+            raise OSError("Change notifications are only available on Windows")
+
+        from ctypes import wintypes
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.FindFirstChangeNotificationW.argtypes = [wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD]
+        kernel32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+        kernel32.FindNextChangeNotification.argtypes = [wintypes.HANDLE]
+        kernel32.FindNextChangeNotification.restype = wintypes.BOOL
+        kernel32.FindCloseChangeNotification.argtypes = [wintypes.HANDLE]
+        kernel32.FindCloseChangeNotification.restype = wintypes.BOOL
+        kernel32.CreateEventW.argtypes = [wintypes.LPVOID, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+        kernel32.CreateEventW.restype = wintypes.HANDLE
+        kernel32.SetEvent.argtypes = [wintypes.HANDLE]
+        kernel32.SetEvent.restype = wintypes.BOOL
+        kernel32.ResetEvent.argtypes = [wintypes.HANDLE]
+        kernel32.ResetEvent.restype = wintypes.BOOL
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        kernel32.CloseHandle.restype = wintypes.BOOL
+        kernel32.WaitForMultipleObjects.argtypes = [
+            wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE), wintypes.BOOL, wintypes.DWORD
+        ]
+        kernel32.WaitForMultipleObjects.restype = wintypes.DWORD
+        self._kernel32 = kernel32
+        self._change_handles: list[int] = []
+        self._wake_handle = None
+
+        super().__init__(folders, match, interval)
+
+        self._wake_handle = kernel32.CreateEventW(None, True, False, None)
+        if not self._wake_handle:
+            raise ctypes.WinError(ctypes.get_last_error())
+
+        mask = self.FILE_NOTIFY_CHANGE_FILE_NAME | self.FILE_NOTIFY_CHANGE_SIZE | self.FILE_NOTIFY_CHANGE_LAST_WRITE
+        try:
+            for folder in self.folders:
+                handle = kernel32.FindFirstChangeNotificationW(folder, False, mask)
+                if not handle or handle == self.INVALID_HANDLE_VALUE:
+                    raise ctypes.WinError(ctypes.get_last_error())
+                self._change_handles.append(handle)
+        except OSError:
+            self.close()
+            raise
+
+        handles = [self._wake_handle, *self._change_handles]
+        self._handles = (wintypes.HANDLE * len(handles))(*handles)
+
+    def wait(self, stop_event: threading.Event) -> set[str]:
+        if not self.alive or stop_event.is_set():
+            return set()
+
+        kernel32 = self._kernel32
+        count = len(self._handles)
+        rc = kernel32.WaitForMultipleObjects(count, self._handles, False, self.INFINITE)
+        index = rc - self.WAIT_OBJECT_0
+        if rc == self.WAIT_FAILED or not 0 <= index < count:
+            self.alive = False
+            return set()
+
+        if index == 0:
+            kernel32.ResetEvent(self._wake_handle)
+            return set()
+
+        # Re-arm before scanning so writes during the scan signal again instead of being missed
+        if not kernel32.FindNextChangeNotification(self._handles[index]):
+            self.alive = False
+        if stop_event.is_set():
+            return set()
+        return self._changes()
+
+    def wake(self):
+        if self._wake_handle:
+            self._kernel32.SetEvent(self._wake_handle)
+
+    def close(self):
+        self.alive = False
+        kernel32 = self._kernel32
+        for handle in self._change_handles:
+            kernel32.FindCloseChangeNotification(handle)
+        self._change_handles = []
+        if self._wake_handle:
+            kernel32.CloseHandle(self._wake_handle)
+            self._wake_handle = None
+
+
+BACKENDS = {
+    InotifyWatcher.name: InotifyWatcher,
+    WindowsChangeWatcher.name: WindowsChangeWatcher,
+    PollingWatcher.name: PollingWatcher,
+}
+
+
+def create_watcher(folders: Iterable[str], match: Callable[[str], bool], backend: str = "auto", interval: float = 1.0):
+    folders = list(folders)
+
+    if backend == "auto":
+        if sys.platform.startswith("linux"):
+            order = [InotifyWatcher, PollingWatcher]
+        elif sys.platform == "win32":
+            order = [WindowsChangeWatcher, PollingWatcher]
+        else:
+            order = [PollingWatcher]
+    else:
+        order = [BACKENDS.get(backend, PollingWatcher)]
+        if order[0] is not PollingWatcher:
+            order.append(PollingWatcher)
+
+    last_error: Exception | None = None
+    for cls in order:
+        try:
+            return cls(folders, match, interval)
+        except OSError as err:
+            last_error = err
+
+    raise last_error or OSError("No watcher backend available")
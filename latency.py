@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from persister import atomic_write_json
+
+
+class LatencyTrace:
+    """Timestamps (time.time_ns) of one detection on its way from the history file to the sound call."""
+
+    __slots__ = ("written_ns", "woken_ns", "parsed_ns", "dispatched_ns", "played_ns")
+
+    def __init__(self, woken_ns: int):
+        self.written_ns: int | None = None
+        self.woken_ns = woken_ns
+        self.parsed_ns: int | None = None
+        self.dispatched_ns: int | None = None
+        self.played_ns: int | None = None
+
+
+class LatencyHistogram:
+    def __init__(self, size: int):
+        self.samples: deque[float] = deque(maxlen=size)
+
+    def add(self, ms: float):
+        self.samples.append(max(0.0, ms))
+
+    def percentiles(self) -> dict[str, float | int]:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"count": 0}
+
+        def pick(p):
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+        return {
+            "count": len(ordered),
+            "p50": pick(0.50),
+            "p95": pick(0.95),
+            "p99": pick(0.99),
+        }
+
+
+class LatencyTracker:
+    STAGES = (
+        ("write_to_wake", "File write → worker wake"),
+        ("wake_to_parsed", "Worker wake → parsed"),
+        ("parsed_to_dispatch", "Parsed → sound dispatch"),
+        ("dispatch_to_play", "Sound dispatch → DLL call"),
+        ("total", "File write → DLL call"),
+    )
+
+    def __init__(self, size: int = 1024):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.histograms = {stage: LatencyHistogram(size) for stage, _ in self.STAGES}
+
+    def _add(self, stage: str, start_ns: int | None, end_ns: int | None):
+        if start_ns is None or end_ns is None:
+            return
+        with self._lock:
+            self.histograms[stage].add((end_ns - start_ns) / 1e6)
+
+    def begin(self) -> LatencyTrace:
+        return LatencyTrace(time.time_ns())
+
+    @contextmanager
+    def active(self, trace: LatencyTrace):
+        # Listeners called inside the block can pick the trace up with current()
+        self._local.trace = trace
+        try:
+            yield trace
+        finally:
+            self._local.trace = None
+
+    def current(self) -> LatencyTrace | None:
+        return getattr(self._local, "trace", None)
+
+    def mark_parsed(self, trace: LatencyTrace | None, written_ns: int | None):
+        if not trace:
+            return
+        trace.written_ns = written_ns
+        trace.parsed_ns = time.time_ns()
+        self._add("write_to_wake", trace.written_ns, trace.woken_ns)
+        self._add("wake_to_parsed", trace.woken_ns, trace.parsed_ns)
+
+    def mark_dispatched(self, trace: LatencyTrace | None):
+        if not trace:
+            return
+        trace.dispatched_ns = time.time_ns()
+        self._add("parsed_to_dispatch", trace.parsed_ns, trace.dispatched_ns)
+
+    def mark_played(self, trace: LatencyTrace | None):
+        # Only the first sound of a detection counts, the rest of a spaced out batch plays later on purpose
+        if not trace or trace.played_ns is not None:
+            return
+        now = trace.played_ns = time.time_ns()
+        self._add("dispatch_to_play", trace.dispatched_ns, now)
+        self._add("total", trace.written_ns, now)
+
+    def summary(self) -> dict[str, dict]:
+        with self._lock:
+            return {stage: hist.percentiles() for stage, hist in self.histograms.items()}
+
+    def format_summary(self) -> str:
+        summary = self.summary()
+        lines = []
+        for stage, label in self.STAGES:
+            stats = summary[stage]
+            if not stats["count"]:
+                lines.append(f"{label}: no samples yet")
+                continue
+            lines.append(
+                f"{label}: p50 {stats['p50']:.1f} ms, p95 {stats['p95']:.1f} ms, "
+                f"p99 {stats['p99']:.1f} ms ({stats['count']} samples)"
+            )
+        return "\n".join(lines)
+
+    def export(self, path: str):
+        with self._lock:
+            data = {
+                "summary": {stage: hist.percentiles() for stage, hist in self.histograms.items()},
+                "samples_ms": {stage: list(hist.samples) for stage, hist in self.histograms.items()},
+            }
+        atomic_write_json(path, data)
+
+    def reset(self):
+        with self._lock:
+            for hist in self.histograms.values():
+                hist.samples.clear()
+
+
+latency = LatencyTracker()
@@ -1,19 +1,29 @@
 from typing import Optional
+from beep_beep_config import config
 from commander_history import history_inst
+from audio_engine import audio_engine
 from beep_beep import beep_inst
 from location import location
 from gui import gui_inst
 from logutil import log
+from persister import persister
+from sound_loader import sound_inst
+from startup import startup
 import tkinter as tk
 import myNotebook as nb  # noqa
 
 def plugin_start3(plugin_dir):
     log.info("beep_beep plugin starting (%s)", plugin_dir)
-    history_inst.load_seen_commanders()
     history_inst.subscribe_sound(beep_inst.handle_event)       
-    history_inst.subscribe_gui(gui_inst.add_or_update_commander)
-    history_inst.aggregated_commanders_load()
-    history_inst.start_worker()
+    history_inst.subscribe_gui(gui_inst.on_history_event)
+    startup.subscribe_ready(gui_inst.on_seen_loaded)
+    # Seen commanders and the CommanderHistory backlog load in the background, journal events wait for them
+    startup.start(
+        (history_inst.load_seen_commanders, history_inst.aggregated_commanders_load, history_inst.start_worker),
+        handle_journal_entry
+    )
+    audio_engine.start_warmup(beep_inst.gain)
+    sound_inst.start_watching(config.get_config("sound_watcher", "auto"))
     return "Beep Beep"
 
 
@@ -23,8 +33,14 @@ def plugin_app(parent):
 
 
 def journal_entry(cmdrname: str, is_beta: bool, system: str, station: str, entry: dict, state: dict) -> None:
+    if "StarSystem" not in entry and system:
+        entry = {**entry, "StarSystem": system}
+    startup.dispatch(entry)
+
+
+def handle_journal_entry(entry: dict) -> None:
     event = entry.get("event")
-    system = entry.get("StarSystem", system)
+    system = entry.get("StarSystem")
     
     if event in ("StartUp", "LoadGame", "Resurrected", "Died"):
         location.set(0, system)
@@ -39,7 +55,7 @@ def journal_entry(cmdrname: str, is_beta: bool, system: str, station: str, entry
         history_inst.trigger()
 
     elif event == "StartJump":
-        location.set(1, entry.get("StarSystem", system))
+        location.set(1, system)
         location.jump()
         
     elif event == "FsdJump":
@@ -67,5 +83,11 @@ def plugin_prefs(parent, cmdr, is_beta):
     return frame_container
 
 def plugin_stop():
+    startup.stop()
     history_inst.stop_worker()
+    sound_inst.stop_watching()
+    persister.stop()
+    beep_inst.dispatcher.stop()
+    audio_engine.close()
+    history_inst.close_store()
     log.info("beep_beep plugin stopped!")
@@ -0,0 +1,172 @@
+import operator
+import sys
+import wave
+from array import array
+from functools import lru_cache
+
+# EDMC ships its own Python without numpy, so all sample math here sticks to array and C level map()
+
+
+class PcmClip:
+    """Interleaved signed 16 bit samples."""
+
+    __slots__ = ("samples", "channels", "frame_rate")
+
+    def __init__(self, samples: array, channels: int, frame_rate: int):
+        self.samples = samples
+        self.channels = channels
+        self.frame_rate = frame_rate
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.samples) * self.samples.itemsize
+
+    @property
+    def frames(self) -> int:
+        return len(self.samples) // max(1, self.channels)
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.frame_rate if self.frame_rate else 0.0
+
+
+def to_int16(frames: bytes, sample_width: int) -> array:
+    if sample_width == 2:
+        data = frames
+    elif sample_width == 1:
+        # 8 bit WAV is unsigned
+        return array("h", map(lambda b: (b - 128) << 8, frames))
+    elif sample_width in (3, 4):
+        # Keep the two most significant bytes of each little endian sample
+        out = bytearray(len(frames) // sample_width * 2)
+        out[0::2] = frames[sample_width - 2::sample_width]
+        out[1::2] = frames[sample_width - 1::sample_width]
+        data = bytes(out)
+    else:
+        raise ValueError(f"Unsupported sample width {sample_width}")
+
+    samples = array("h")
+    samples.frombytes(data[:len(data) - len(data) % 2])
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples
+
+
+def decode_wav(path: str) -> PcmClip:
+    with wave.open(path, "rb") as w:
+        channels = w.getnchannels()
+        width = w.getsampwidth()
+        rate = w.getframerate()
+        frames = w.readframes(w.getnframes())
+    return PcmClip(to_int16(frames, width), channels, rate)
+
+
+@lru_cache(maxsize=16)
+def _gain_table(gain: float) -> list[int]:
+    # Indexed by the unsigned view of a sample, so scaling is a single map() over the buffer
+    table = []
+    for u in range(65536):
+        s = u - 65536 if u >= 32768 else u
+        v = int(s * gain)
+        table.append(32767 if v > 32767 else -32768 if v < -32768 else v)
+    return table
+
+
+def scale(samples: array, gain: float) -> array:
+    gain = round(gain, 3)
+    if gain == 1.0:
+        return array("h", samples)
+    if gain <= 0.0:
+        return array("h", bytes(len(samples) * 2))
+
+    unsigned = array("H")
+    unsigned.frombytes(samples.tobytes())
+    return array("h", map(_gain_table(gain).__getitem__, unsigned))
+
+
+def to_wav_bytes(clip: PcmClip) -> bytes:
+    samples = clip.samples
+    if sys.byteorder == "big":
+        samples = array("h", samples)
+        samples.byteswap()
+
+    data = samples.tobytes()
+    header = b"".join((
+        b"RIFF", (36 + len(data)).to_bytes(4, "little"), b"WAVE",
+        b"fmt ", (16).to_bytes(4, "little"), (1).to_bytes(2, "little"),
+        clip.channels.to_bytes(2, "little"), clip.frame_rate.to_bytes(4, "little"),
+        (clip.frame_rate * clip.channels * 2).to_bytes(4, "little"),
+        (clip.channels * 2).to_bytes(2, "little"), (16).to_bytes(2, "little"),
+        b"data", len(data).to_bytes(4, "little"),
+    ))
+    return header + data
+
+
+def _clamp16(v: int) -> int:
+    return 32767 if v > 32767 else -32768 if v < -32768 else v
+
+
+def convert(clip: PcmClip, channels: int, frame_rate: int) -> array:
+    """Nearest neighbour resample and channel up/down mix, good enough for short alert sounds."""
+    samples = clip.samples
+    if clip.channels != channels:
+        if clip.channels == 1:
+            out = array("h", bytes(len(samples) * channels * 2))
+            for c in range(channels):
+                out[c::channels] = samples
+            samples = out
+        else:
+            samples = samples[0::clip.channels]
+            if channels > 1:
+                out = array("h", bytes(len(samples) * channels * 2))
+                for c in range(channels):
+                    out[c::channels] = samples
+                samples = out
+
+    if clip.frame_rate != frame_rate and clip.frame_rate:
+        frames = len(samples) // channels
+        new_frames = frames * frame_rate // clip.frame_rate
+        step = clip.frame_rate / frame_rate
+        out = array("h", bytes(new_frames * channels * 2))
+        for c in range(channels):
+            src = samples[c::channels]
+            out[c::channels] = array("h", (src[int(i * step)] for i in range(new_frames)))
+        samples = out
+
+    return samples
+
+
+def mix_into(dest: array, offset: int, src: array):
+    end = min(len(dest), offset + len(src))
+    if end <= offset:
+        return
+    dest[offset:end] = array("h", map(_clamp16, map(operator.add, dest[offset:end], src[:end - offset])))
+
+
+def mix(voices: list[tuple[PcmClip, float]], channels: int = 2, frame_rate: int = 44100) -> PcmClip:
+    """Sums every voice at its gain into one clip, a peak limiter scales the sum back into 16 bit range."""
+    # The same clip arriving several times is summed once and multiplied
+    grouped: dict[int, tuple[PcmClip, float]] = {}
+    for clip, gain in voices:
+        prev = grouped.get(id(clip))
+        grouped[id(clip)] = (clip, gain + (prev[1] if prev else 0.0))
+
+    converted = [(convert(clip, channels, frame_rate), gain) for clip, gain in grouped.values()]
+    length = max((len(samples) for samples, _ in converted), default=0)
+    acc = array("i", bytes(length * 4))
+
+    for samples, gain in converted:
+        if gain == int(gain):
+            if gain != 1:
+                samples = array("i", map(int(gain).__mul__, samples))
+        else:
+            samples = array("i", map(int, map(float(gain).__mul__, samples)))
+        n = len(samples)
+        acc[:n] = array("i", map(operator.add, acc[:n], samples))
+
+    peak = max(max(acc, default=0), -min(acc, default=0))
+    if peak > 32767:
+        out = array("h", map(int, map((32767 / peak).__mul__, acc)))
+    else:
+        out = array("h", acc)
+    return PcmClip(out, channels, frame_rate)
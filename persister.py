@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable
+from logutil import log
+
+
+def atomic_write_json(path: str, data, indent: int | None = 2):
+    # Write next to the target and rename over it, a crash leaves either the old or the new file
+    folder = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=folder)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class WriteBehindPersister:
+    """Collects dirty state by key and flushes it on a background thread after a debounce delay."""
+
+    def __init__(self, delay: float = 1.0, max_delay: float = 5.0):
+        self.delay = delay
+        self.max_delay = max_delay
+        self._pending: dict[str, Callable[[], None]] = {}
+        self._first_dirty: float | None = None
+        self._due: float | None = None
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    def schedule(self, key: str, flush_fn: Callable[[], None]):
+        with self._cond:
+            now = time.monotonic()
+            self._pending[key] = flush_fn
+            if self._first_dirty is None:
+                self._first_dirty = now
+            # Debounce, but never hold dirty state longer than max_delay
+            self._due = min(now + self.delay, self._first_dirty + self.max_delay)
+
+            if self._stopping:
+                return
+
+            if not self._thread or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True, name="BeepBeepPersister")
+                self._thread.start()
+            self._cond.notify()
+
+    def _take_pending(self) -> dict[str, Callable[[], None]]:
+        pending, self._pending = self._pending, {}
+        self._first_dirty = None
+        self._due = None
+        return pending
+
+    def _run_all(self, pending: dict[str, Callable[[], None]]):
+        with self._flush_lock:
+            for key, flush_fn in pending.items():
+                try:
+                    flush_fn()
+                except Exception:
+                    log.exception("Failed to persist %s", key)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopping and (self._due is None or self._due > time.monotonic()):
+                    timeout = None if self._due is None else self._due - time.monotonic()
+                    self._cond.wait(timeout)
+                if self._stopping:
+                    return
+                pending = self._take_pending()
+
+            self._run_all(pending)
+
+    def flush(self):
+        with self._cond:
+            pending = self._take_pending()
+        self._run_all(pending)
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.flush()
+
+
+persister = WriteBehindPersister()
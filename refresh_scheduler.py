@@ -0,0 +1,56 @@
+import heapq
+import math
+
+
+class RefreshScheduler:
+    """Row ids grouped in one bucket per second at which their label next changes.
+
+    A heap of bucket times sits next to the buckets, so finding due rows only touches buckets that are
+    actually due. Rescheduling a row moves it between buckets, emptied buckets are dropped when popped.
+    """
+
+    def __init__(self):
+        self._buckets: dict[int, set[str]] = {}
+        self._heap: list[int] = []
+        self._due: dict[str, int] = {}
+
+    def schedule(self, row_id: str, due: float):
+        slot = math.ceil(due)
+        old = self._due.get(row_id)
+        if old == slot:
+            return
+        if old is not None:
+            self._buckets[old].discard(row_id)
+
+        self._due[row_id] = slot
+        bucket = self._buckets.get(slot)
+        if bucket is None:
+            bucket = self._buckets[slot] = set()
+            heapq.heappush(self._heap, slot)
+        bucket.add(row_id)
+
+    def discard(self, row_id: str):
+        slot = self._due.pop(row_id, None)
+        if slot is not None:
+            self._buckets[slot].discard(row_id)
+
+    def pop_due(self, now: float) -> set[str]:
+        due: set[str] = set()
+        heap = self._heap
+        while heap and heap[0] <= now:
+            bucket = self._buckets.pop(heapq.heappop(heap), ())
+            for row_id in bucket:
+                del self._due[row_id]
+            due |= bucket
+        return due
+
+    def next_due(self) -> int | None:
+        return self._heap[0] if self._heap else None
+
+    def clear(self):
+        self._buckets.clear()
+        self._heap.clear()
+        self._due.clear()
+
+    def __len__(self) -> int:
+        return len(self._due)
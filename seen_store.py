@@ -0,0 +1,145 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Iterable
+
+UNKNOWN_SEEN = 0
+
+
+def parse_last_seen(value) -> int:
+    """Epoch seconds from a stored last_seen, converting the ISO text older versions wrote."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        ts = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return UNKNOWN_SEEN
+    return int((ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)).timestamp())
+
+
+class SeenCommanderStore:
+    """SQLite (WAL) backed storage for seen commanders, only changed rows are written."""
+
+    COLUMNS = ("commander_id", "name", "sound", "last_seen")
+    TABLE_SCHEMA = (
+        "commander_id TEXT PRIMARY KEY, "
+        "name TEXT NOT NULL, "
+        "sound TEXT NOT NULL, "
+        "last_seen INTEGER NOT NULL"
+    )
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        with self._lock:
+            if self._conn:
+                return
+
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(f"CREATE TABLE IF NOT EXISTS commanders ({self.TABLE_SCHEMA})")
+                self._migrate_last_seen(conn)
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._conn = conn
+
+    @classmethod
+    def _migrate_last_seen(cls, conn: sqlite3.Connection):
+        """Rewrites a table that still stores last_seen as ISO text with integer epoch seconds."""
+        columns = {row[1]: row[2].upper() for row in conn.execute("PRAGMA table_info(commanders)")}
+        if columns.get("last_seen") == "INTEGER":
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = [
+                (cmdr_id, name, sound, parse_last_seen(last_seen))
+                for cmdr_id, name, sound, last_seen in
+                conn.execute("SELECT commander_id, name, sound, last_seen FROM commanders")
+            ]
+            conn.execute(f"CREATE TABLE commanders_new ({cls.TABLE_SCHEMA})")
+            conn.executemany("INSERT INTO commanders_new VALUES (?, ?, ?, ?)", rows)
+            conn.execute("DROP TABLE commanders")
+            conn.execute("ALTER TABLE commanders_new RENAME TO commanders")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM commanders LIMIT 1").fetchone() is None
+
+    def load_all(self) -> dict[str, dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT commander_id, name, sound, last_seen FROM commanders").fetchall()
+
+        return {
+            row[0]: dict(zip(self.COLUMNS, row))
+            for row in rows
+        }
+
+    def upsert(self, entries: Iterable[dict]):
+        rows = [
+            (
+                str(entry["commander_id"]),
+                entry.get("name", "unknown"),
+                entry.get("sound", "neutral"),
+                parse_last_seen(entry.get("last_seen")),
+            )
+            for entry in entries
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            conn = self._conn
+            if conn is None:
+                raise sqlite3.ProgrammingError("Seen commander store is not open")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO commanders (commander_id, name, sound, last_seen) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(commander_id) DO UPDATE SET "
+                    "name=excluded.name, sound=excluded.sound, last_seen=excluded.last_seen",
+                    rows
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def migrate_json(self, json_path: str) -> int:
+        """One time import of the old seen_commanders.json, renamed to .migrated once committed."""
+        if not os.path.isfile(json_path):
+            return 0
+
+        if os.path.getsize(json_path) > 0:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        else:
+            data = {}
+
+        entries = []
+        for cmdr_id, entry in data.items():
+            if not isinstance(entry, dict) or "last_seen" not in entry:
+                continue
+            entries.append({**entry, "commander_id": str(cmdr_id)})
+
+        self.upsert(entries)
+        os.replace(json_path, json_path + ".migrated")
+        return len(entries)
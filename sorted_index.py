@@ -0,0 +1,95 @@
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Sequence
+
+_MISSING = object()
+
+
+class SortedIndex(Sequence):
+    """Row ids kept in order of key(row_id), with bisect inserts and repositions.
+
+    Entries are stored ascending as (key, row_id) so ties have a stable order, reverse only changes how
+    the sequence is read. The key of every row is remembered so its old position can be found without
+    knowing what changed.
+    """
+
+    def __init__(self, key: Callable[[str], Any], reverse: bool = False):
+        self.key = key
+        self.reverse = reverse
+        self._entries: list[tuple[Any, str]] = []
+        self._keys: dict[str, Any] = {}
+
+    def rebuild(self, row_ids: Iterable[str]):
+        key = self.key
+        self._keys = {row_id: key(row_id) for row_id in row_ids}
+        self._entries = sorted((k, row_id) for row_id, k in self._keys.items())
+
+    def _find(self, row_id: str) -> int:
+        entry = (self._keys[row_id], row_id)
+        return bisect_left(self._entries, entry)
+
+    def update(self, row_id: str) -> bool:
+        """Adds or repositions row_id, True if its position changed."""
+        new_key = self.key(row_id)
+        old_key = self._keys.get(row_id, _MISSING)
+        if old_key is not _MISSING:
+            if old_key == new_key:
+                return False
+            del self._entries[self._find(row_id)]
+
+        self._keys[row_id] = new_key
+        insort(self._entries, (new_key, row_id))
+        return True
+
+    def discard(self, row_id: str) -> bool:
+        if row_id not in self._keys:
+            return False
+        del self._entries[self._find(row_id)]
+        del self._keys[row_id]
+        return True
+
+    def range(self, lo: Any = None, hi: Any = None) -> list[str]:
+        """Row ids whose key lies within [lo, hi] in ascending key order, None leaves that side open."""
+        entries = self._entries
+        start = 0 if lo is None else bisect_left(entries, lo, key=itemgetter(0))
+        stop = len(entries) if hi is None else bisect_right(entries, hi, key=itemgetter(0))
+        return [row_id for _, row_id in entries[start:stop]]
+
+    def select(self, row_ids: set[str]) -> list[str]:
+        """The given row ids in sequence order, one pass over the index."""
+        selected = [row_id for _, row_id in self._entries if row_id in row_ids]
+        if self.reverse:
+            selected.reverse()
+        return selected
+
+    def position(self, row_id: str) -> int:
+        pos = self._find(row_id)
+        return len(self._entries) - 1 - pos if self.reverse else pos
+
+    def __contains__(self, row_id) -> bool:
+        return row_id in self._keys
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, i):
+        entries = self._entries
+        n = len(entries)
+        if isinstance(i, slice):
+            start, stop, step = i.indices(n)
+            if step != 1:
+                return [self[j] for j in range(start, stop, step)]
+            if not self.reverse:
+                return [row_id for _, row_id in entries[start:stop]]
+            return [row_id for _, row_id in reversed(entries[n - stop:n - start])]
+
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        return entries[n - 1 - i if self.reverse else i][1]
+
+    def index(self, row_id) -> int:
+        if row_id not in self._keys:
+            raise ValueError(row_id)
+        return self.position(row_id)
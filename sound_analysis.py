@@ -0,0 +1,89 @@
+import math
+import operator
+import os
+import wave
+from typing import NamedTuple
+from pcm import decode_wav
+
+ANALYSIS_ERRORS = (OSError, EOFError, ValueError, wave.Error)
+
+
+class SoundStats(NamedTuple):
+    duration: float
+    frame_rate: int
+    channels: int
+    rms_dbfs: float | None
+    peak_dbfs: float | None
+
+
+def _dbfs(level: float) -> float | None:
+    return round(20 * math.log10(level / 32768), 2) if level > 0 else None
+
+
+def analyse_wav(path: str) -> SoundStats:
+    clip = decode_wav(path)
+    samples = clip.samples
+    if not samples:
+        return SoundStats(0.0, clip.frame_rate, clip.channels, None, None)
+
+    # Sum of squares and extremes stay inside C level map()/max()/min()
+    rms = math.sqrt(sum(map(operator.mul, samples, samples)) / len(samples))
+    peak = max(max(samples), -min(samples))
+    return SoundStats(round(clip.duration, 3), clip.frame_rate, clip.channels, _dbfs(rms), _dbfs(peak))
+
+
+_MP3_BITRATES = {
+    (3, 1): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def analyse_mp3(path: str) -> SoundStats:
+    """Format and duration from the first Layer III frame header, assuming a constant bitrate.
+
+    MP3 cannot be decoded here so loudness stays unknown.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(64 * 1024)
+
+    offset = 0
+    if head[:3] == b"ID3" and len(head) >= 10:
+        offset = 10 + ((head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9])
+        with open(path, "rb") as f:
+            f.seek(offset)
+            head = f.read(64 * 1024)
+
+    for i in range(len(head) - 3):
+        if head[i] != 0xFF or head[i + 1] & 0xE0 != 0xE0:
+            continue
+        version = (head[i + 1] >> 3) & 3
+        layer = (head[i + 1] >> 1) & 3
+        bitrate_idx = head[i + 2] >> 4
+        rate_idx = (head[i + 2] >> 2) & 3
+        if version == 1 or layer != 1 or bitrate_idx in (0, 15) or rate_idx == 3:
+            continue
+
+        bitrate = _MP3_BITRATES[(3 if version == 3 else 2, layer)][bitrate_idx] * 1000
+        channels = 1 if head[i + 3] >> 6 == 3 else 2
+        duration = (size - offset - i) * 8 / bitrate
+        return SoundStats(round(duration, 3), _MP3_RATES[version][rate_idx], channels, None, None)
+
+    raise ValueError("No MPEG audio frame found")
+
+
+def analyse(path: str) -> SoundStats:
+    if path.lower().endswith(".wav"):
+        return analyse_wav(path)
+    return analyse_mp3(path)
+
+
+def normalization_gain(stats: SoundStats | None, target_dbfs: float, headroom_dbfs: float = -1.0,
+                       max_gain: float = 4.0) -> float:
+    """Gain bringing the RMS level to target_dbfs without pushing the peak above headroom_dbfs."""
+    if not stats or stats.rms_dbfs is None or stats.peak_dbfs is None:
+        return 1.0
+
+    gain_db = min(target_dbfs - stats.rms_dbfs, headroom_dbfs - stats.peak_dbfs)
+    return round(min(max_gain, max(1 / max_gain, 10 ** (gain_db / 20))), 3)
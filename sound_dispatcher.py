@@ -0,0 +1,87 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable
+from logutil import log
+
+
+class SoundDispatcher:
+    """One thread playing queued sounds at their due time, ordered by a heap of (play_at, seq) jobs."""
+
+    def __init__(self, play_fn: Callable[[Any, Any], None], max_depth: int = 32):
+        self.play_fn = play_fn
+        self.max_depth = max_depth
+        self._heap: list[tuple[float, int, int, Any, Any]] = []
+        self._seq = itertools.count()
+        self._generation = 0
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self.dropped = 0
+
+    def submit(self, sounds: list, spacing: float, trace: Any = None, replace: bool = True) -> int:
+        with self._cond:
+            if self._stopping:
+                return self._generation
+
+            if replace:
+                # A newer batch makes whatever is left of the previous one stale
+                self._generation += 1
+                self._heap = [job for job in self._heap if job[2] == self._generation]
+                heapq.heapify(self._heap)
+
+            now = time.monotonic()
+            for i, sound in enumerate(sounds):
+                if len(self._heap) >= self.max_depth:
+                    self.dropped += len(sounds) - i
+                    log.info("Sound queue full (%d), dropping %d sounds", self.max_depth, len(sounds) - i)
+                    break
+                heapq.heappush(self._heap, (now + i * spacing, next(self._seq), self._generation, sound, trace))
+
+            if not self._thread or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True, name="BeepBeepSoundDispatcher")
+                self._thread.start()
+            self._cond.notify()
+            return self._generation
+
+    def cancel(self):
+        with self._cond:
+            self._generation += 1
+            self._heap.clear()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    if self._heap:
+                        delay = self._heap[0][0] - time.monotonic()
+                        if delay <= 0:
+                            break
+                        self._cond.wait(delay)
+                    else:
+                        self._cond.wait()
+                if self._stopping:
+                    return
+
+                _, _, generation, sound, trace = heapq.heappop(self._heap)
+                if generation != self._generation:
+                    continue
+
+            try:
+                self.play_fn(sound, trace)
+            except Exception:
+                log.exception("Failed to play queued sound %s", sound)
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._heap.clear()
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=2)
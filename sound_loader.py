@@ -1,74 +1,315 @@
+import json
 import os
+import stat
+import threading
+from typing import Callable, Iterable, NamedTuple
+from history_watcher import create_watcher
+from logutil import log
+from persister import atomic_write_json
+from sound_analysis import ANALYSIS_ERRORS, SoundStats, analyse
+
+
+class SoundFile(NamedTuple):
+    file: str
+    mtime_ns: int
+    size: int
+    ext: str
+
 
 class SoundLoader:
 
     CORE = ["neutral", "friend", "foe"]
+    EXTENSIONS = (".wav", ".mp3")
 
-    def __init__(self):
-        self.plugin_dir = os.path.dirname(__file__)
+    def __init__(self, plugin_dir: str | None = None):
+        self.plugin_dir = plugin_dir or os.path.dirname(__file__)
         self.sounds_dir = os.path.join(self.plugin_dir, "sounds")
         self.default_dir = os.path.join(self.sounds_dir, "default")
+        self.index_path = os.path.join(self.plugin_dir, "sound_index.json")
+        self.stats_path = os.path.join(self.plugin_dir, "sound_stats.json")
         self.sound_map: dict[str, str] = {}
+        self.sound_files: list[str] = []
         self.neutral: str | None = None
+        self.sound_info: dict[str, tuple[str, SoundFile]] = {}
+        self.version = 0
+        self.index: dict[str, dict[str, SoundFile]] = {}
+        self._stored_index: dict[str, dict] | None = None
+        self.stats: dict[str, SoundStats] = {}
+        self._stored_stats: dict[str, list] | None = None
+        self._analysis_lock = threading.Lock()
+        self._load_lock = threading.RLock()
+        self._listeners: list[Callable[[], None]] = []
+        self._watch_thread: threading.Thread | None = None
+        self._watch_stop = threading.Event()
+        self._watcher = None
         self.load_sounds()
 
-    def _newest_match(self, folder, base_name):
-        if not os.path.isdir(folder):
-            return None
-
-        candidates = []
-        for f in os.listdir(folder):
-            name, ext = os.path.splitext(f)
-            if name.lower() != base_name:
-                continue
-            if ext.lower() not in (".wav", ".mp3"):
-                continue
-            full = os.path.join(folder, f)
-            if os.path.isfile(full):
-                candidates.append(f)
-
-        if not candidates:
-            return None
-
-        candidates.sort(
-            key=lambda f: os.path.getmtime(os.path.join(folder, f)),
-            reverse=True
-        )
-        return candidates[0]
+    @classmethod
+    def is_sound_file(cls, name: str) -> bool:
+        return os.path.splitext(name)[1].lower() in cls.EXTENSIONS
+
+    def subscribe(self, cb: Callable[[], None]):
+        self._listeners.append(cb)
+
+    def _publish(self):
+        for cb in self._listeners:
+            try:
+                cb()
+            except Exception:
+                log.exception("Sound change listener failed")
+
+    def _read_stored_index(self) -> dict[str, dict]:
+        if self._stored_index is None:
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._stored_index = json.load(f)
+            except (OSError, ValueError):
+                self._stored_index = {}
+        return self._stored_index
+
+    def _scan_dir(self, folder: str, force: bool = False) -> tuple[int | None, dict[str, SoundFile]]:
+        """One scandir pass, newest .wav/.mp3 per lower case name.
+
+        The stored index is reused while the folder mtime is unchanged. Overwriting a file in place does not
+        touch the folder mtime, so an explicit reload passes force to always rescan.
+        """
+        try:
+            dir_mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            return None, {}
+
+        stored = None if force else self._read_stored_index().get(folder)
+        if stored and stored.get("mtime_ns") == dir_mtime:
+            try:
+                return dir_mtime, {name: SoundFile(*entry) for name, entry in stored["entries"].items()}
+            except (KeyError, TypeError):
+                pass
+
+        entries: dict[str, SoundFile] = {}
+        try:
+            with os.scandir(folder) as it:
+                for e in it:
+                    name, ext = os.path.splitext(e.name)
+                    ext = ext.lower()
+                    if ext not in self.EXTENSIONS or not e.is_file():
+                        continue
+                    st = e.stat()
+                    name = name.lower()
+                    current = entries.get(name)
+                    if current is None or st.st_mtime_ns > current.mtime_ns:
+                        entries[name] = SoundFile(e.name, st.st_mtime_ns, st.st_size, ext)
+        except OSError:
+            return None, {}
+
+        return dir_mtime, entries
+
+    def _store_index(self, dir_mtimes: dict[str, int | None]):
+        data = {
+            folder: {"mtime_ns": mtime, "entries": {name: list(sf) for name, sf in self.index[folder].items()}}
+            for folder, mtime in dir_mtimes.items()
+            if mtime is not None
+        }
+        if data == self._stored_index:
+            return
 
-    def load_sounds(self):
+        try:
+            atomic_write_json(self.index_path, data, indent=None)
+            self._stored_index = data
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def build_map(self) -> tuple[dict[str, str], dict[str, tuple[str, SoundFile]]]:
+        sounds = self.index.get(self.sounds_dir, {})
+        defaults = self.index.get(self.default_dir, {})
+
+        sound_map: dict[str, str] = {}
+        sound_info: dict[str, tuple[str, SoundFile]] = {}
         for core in self.CORE:
-            file = self._newest_match(self.sounds_dir, core)
-            if file:
-                self.sound_map[core] = file
-                if core == "neutral":
-                    self.neutral = file
-            else:
-                file = self._newest_match(self.default_dir, core)
-                if file:
-                    self.sound_map[core] = os.path.join("default", file)
-                    if core == "neutral":
-                        self.neutral = os.path.join("default", file)  
-
-        if os.path.isdir(self.sounds_dir):
-            for f in os.listdir(self.sounds_dir):
-                full = os.path.join(self.sounds_dir, f)
-                if not os.path.isfile(full):
-                    continue
-                name, ext = os.path.splitext(f)
-                name = name.lower()
-                if name in self.sound_map:
-                    existing_file = os.path.join(self.sounds_dir, self.sound_map[name])
-                    if os.path.getmtime(full) > os.path.getmtime(existing_file):
-                        self.sound_map[name] = f
-                else:
-                    if ext.lower() in (".wav", ".mp3"):
-                        self.sound_map[name] = f
-
-        self.sound_map["none"] = "none"
-        self.sound_files = list(self.sound_map.keys())
-        
+            if core in sounds:
+                sound_map[core] = sounds[core].file
+                sound_info[core] = (os.path.join(self.sounds_dir, sounds[core].file), sounds[core])
+            elif core in defaults:
+                sound_map[core] = os.path.join("default", defaults[core].file)
+                sound_info[core] = (os.path.join(self.default_dir, defaults[core].file), defaults[core])
+
+        for name, sf in sounds.items():
+            if name not in sound_map:
+                sound_map[name] = sf.file
+                sound_info[name] = (os.path.join(self.sounds_dir, sf.file), sf)
+
+        sound_map["none"] = "none"
+        return sound_map, sound_info
+
+    def _swap(self, dir_mtimes: dict[str, int | None]):
+        self._store_index(dir_mtimes)
+
+        sound_map, sound_info = self.build_map()
+        # Swap whole objects so readers never see a half built map
+        self.sound_map = sound_map
+        self.sound_info = sound_info
+        self.neutral = sound_map.get("neutral")
+        self.sound_files = list(sound_map.keys())
+        self.version += 1
+
+    def load_sounds(self, force: bool = False):
+        with self._load_lock:
+            dir_mtimes = {}
+            for folder in (self.sounds_dir, self.default_dir):
+                dir_mtimes[folder], self.index[folder] = self._scan_dir(folder, force)
+            self._swap(dir_mtimes)
+        self._publish()
+
     def reload(self):
-        self.load_sounds()
+        self.load_sounds(force=True)
+
+    @classmethod
+    def _refresh_entry(cls, folder: str, entries: dict[str, SoundFile], filename: str):
+        base, ext = os.path.splitext(filename)
+        name = base.lower()
+        current = entries.get(name)
+
+        try:
+            st = os.stat(os.path.join(folder, filename))
+            exists = stat.S_ISREG(st.st_mode)
+        except OSError:
+            exists = False
+
+        if exists:
+            candidate = SoundFile(filename, st.st_mtime_ns, st.st_size, ext.lower())
+            if current is None or current.file == filename or candidate.mtime_ns >= current.mtime_ns:
+                entries[name] = candidate
+            return
+
+        if current is None or current.file != filename:
+            return
+
+        del entries[name]
+        # Another file with the same name but a different extension or case may take over
+        try:
+            siblings = [f for f in os.listdir(folder) if f != filename and os.path.splitext(f)[0].lower() == name]
+        except OSError:
+            return
+        for sibling in siblings:
+            if cls.is_sound_file(sibling):
+                cls._refresh_entry(folder, entries, sibling)
+
+    def apply_changes(self, paths: Iterable[str]):
+        """Updates the index for the given files only and swaps in a new map."""
+        with self._load_lock:
+            touched = set()
+            for path in paths:
+                folder, filename = os.path.split(path)
+                if folder not in self.index or not self.is_sound_file(filename):
+                    continue
+                entries = dict(self.index[folder])
+                self._refresh_entry(folder, entries, filename)
+                self.index[folder] = entries
+                touched.add(folder)
+
+            if not touched:
+                return
+
+            dir_mtimes = {}
+            for folder in (self.sounds_dir, self.default_dir):
+                try:
+                    dir_mtimes[folder] = os.stat(folder).st_mtime_ns
+                except OSError:
+                    dir_mtimes[folder] = None
+            self._swap(dir_mtimes)
+
+        log.info("Sounds changed, %d sounds available", len(self.sound_map) - 1)
+        self._publish()
+
+    def _read_stored_stats(self) -> dict[str, list]:
+        if self._stored_stats is None:
+            try:
+                with open(self.stats_path, "r", encoding="utf-8") as f:
+                    self._stored_stats = json.load(f)
+            except (OSError, ValueError):
+                self._stored_stats = {}
+        return self._stored_stats
+
+    def analyse(self) -> int:
+        """Fills stats for every mapped sound, only files missing from the on disk cache are decoded.
+
+        The cache is keyed by path and invalidated by (mtime_ns, size), returns the number of files analysed.
+        Files are stat'ed here rather than trusting the sound index, which is reused while the folder mtime
+        is unchanged and so misses a file overwritten in place while EDMC was closed.
+        """
+        with self._analysis_lock:
+            stored = self._read_stored_stats()
+            cache: dict[str, list] = {}
+            stats: dict[str, SoundStats] = {}
+
+            for path, _sf in list(self.sound_info.values()):
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                signature = [st.st_mtime_ns, st.st_size]
+                entry = stored.get(path)
+                if entry and entry[:2] == signature:
+                    try:
+                        stats[path] = SoundStats(*entry[2:])
+                        cache[path] = entry
+                        continue
+                    except TypeError:
+                        pass
+
+                try:
+                    result = analyse(path)
+                except ANALYSIS_ERRORS as err:
+                    log.info("Cannot analyse %s: %s", path, err)
+                    continue
+                stats[path] = result
+                cache[path] = [*signature, *result]
+
+            analysed = sum(1 for path in cache if stored.get(path) != cache[path])
+            if cache != stored:
+                try:
+                    atomic_write_json(self.stats_path, cache, indent=None)
+                    self._stored_stats = cache
+                except (OSError, TypeError, ValueError):
+                    pass
+
+            self.stats = stats
+            return analysed
+
+    def start_watching(self, backend: str = "auto"):
+        if self._watch_thread and self._watch_thread.is_alive():
+            return
+
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(
+            target=self._watch_loop, args=(backend,), daemon=True, name="BeepBeepSoundWatcher"
+        )
+        self._watch_thread.start()
+
+    def stop_watching(self):
+        self._watch_stop.set()
+        if self._watcher:
+            self._watcher.wake()
+        if self._watch_thread:
+            self._watch_thread.join(timeout=3)
+
+    def _watch_loop(self, backend: str):
+        while not self._watch_stop.is_set():
+            try:
+                if not self._watcher or not self._watcher.alive:
+                    if self._watcher:
+                        self._watcher.close()
+                    self._watcher = create_watcher([self.sounds_dir, self.default_dir], self.is_sound_file, backend)
+
+                changed = self._watcher.wait(self._watch_stop)
+                if changed and not self._watch_stop.is_set():
+                    self.apply_changes(changed)
+            except Exception:
+                log.exception("Exception in sound folder watcher, continuing")
+                if self._watch_stop.wait(5):
+                    break
+
+        if self._watcher:
+            self._watcher.close()
+            self._watcher = None
 
 sound_inst = SoundLoader()
@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Sequence
+from logutil import log
+
+
+class StartupManager:
+    """Runs the slow part of plugin start on a background thread.
+
+    Journal events handed to dispatch() before the warm-up steps are done are queued and replayed in
+    order on the warm-up thread once it finishes, later events run directly on the caller.
+    """
+
+    def __init__(self):
+        self.ready = threading.Event()
+        self.elapsed: float | None = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._pending: deque[dict] = deque()
+        self._handler: Callable[[dict], None] | None = None
+        self._ready_listeners: list[Callable[[], None]] = []
+        self._thread: threading.Thread | None = None
+
+    def subscribe_ready(self, cb: Callable[[], None]):
+        self._ready_listeners.append(cb)
+
+    def start(self, steps: Sequence[Callable[[], None]], handler: Callable[[dict], None]):
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._handler = handler
+        self._stop_event.clear()
+        self.ready.clear()
+        self._thread = threading.Thread(target=self._run, args=(tuple(steps),), daemon=True, name="BeepBeepStartup")
+        self._thread.start()
+
+    def dispatch(self, entry: dict):
+        with self._lock:
+            if not self.ready.is_set():
+                self._pending.append(entry)
+                return
+        self._handle(entry)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self.ready.wait(timeout)
+
+    def stop(self, timeout: float = 3):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                log.warning("Startup warm-up still running at shutdown")
+
+    def _handle(self, entry: dict):
+        try:
+            self._handler(entry)
+        except Exception:
+            log.exception("Failed to handle journal event %s", entry.get("event"))
+
+    def _run(self, steps: tuple[Callable[[], None], ...]):
+        start = time.perf_counter()
+        for step in steps:
+            if self._stop_event.is_set():
+                return
+            try:
+                step()
+            except Exception:
+                log.exception("Startup step %s failed, continuing", getattr(step, "__name__", step))
+
+        # Replay under the lock so events arriving meanwhile cannot overtake the queued ones
+        with self._lock:
+            while self._pending:
+                self._handle(self._pending.popleft())
+            self.ready.set()
+
+        self.elapsed = time.perf_counter() - start
+        log.info("Startup warm-up finished in %.2f s", self.elapsed)
+        for cb in self._ready_listeners:
+            try:
+                cb()
+            except Exception:
+                log.exception("Startup ready listener failed")
+
+
+startup = StartupManager()
@@ -0,0 +1,151 @@
+from tkinter import ttk
+from typing import Callable, Sequence
+
+
+class VirtualTable:
+    """Treeview that only holds the rows around the visible window.
+
+    The model is a sorted sequence of row ids, their values are fetched through row_values when a row is
+    paged in. A fixed pool of Treeview items is reused, so memory and redraw cost depend on the window
+    height and not on the number of rows. The Treeview scrolls natively inside the pool, once the view
+    gets within half the overscan of the pool edge the pool is re-centred on it.
+    """
+
+    def __init__(self, parent, columns: Sequence[str], row_values: Callable[[str], tuple],
+                 row_height: int = 20, overscan: int = 20):
+        self.tree = ttk.Treeview(parent, columns=tuple(columns), show="headings", selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.yview)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+        self.row_values = row_values
+        self.row_height = max(1, row_height)
+        self.overscan = overscan
+        self.rows: Sequence[str] = ()
+        self.top = 0
+        self.selected: str | None = None
+        self._start = 0
+        self._pool: list[str] = []
+        self._items: dict[str, str] = {}
+        self._rows_by_item: dict[str, str] = {}
+        self._render_id = None
+
+        self.tree.bind("<Configure>", lambda _event: self.schedule_render(), add="+")
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        for key, step in (("<Home>", -1), ("<End>", 1)):
+            self.tree.bind(key, lambda _event, step=step: self._jump(step), add="+")
+
+    @property
+    def visible_rows(self) -> int:
+        return max(1, self.tree.winfo_height() // self.row_height - 1)
+
+    def set_rows(self, rows: Sequence[str], top: int | None = None):
+        self.rows = rows
+        self.render(top)
+
+    def row_for_item(self, item: str) -> str | None:
+        return self._rows_by_item.get(item)
+
+    def item_for_row(self, row_id: str) -> str | None:
+        return self._items.get(row_id)
+
+    def refresh_row(self, row_id: str):
+        item = self._items.get(row_id)
+        if item:
+            self.tree.item(item, values=self.row_values(row_id))
+
+    def refresh(self):
+        for row_id, item in self._items.items():
+            self.tree.item(item, values=self.row_values(row_id))
+
+    def schedule_render(self):
+        if self._render_id is None:
+            self._render_id = self.tree.after_idle(self._deferred_render)
+
+    def _deferred_render(self):
+        self._render_id = None
+        if self.tree.winfo_exists():
+            self.render()
+
+    def render(self, top: int | None = None):
+        total = len(self.rows)
+        visible = self.visible_rows
+        top = self.top if top is None else top
+        top = max(0, min(top, total - visible))
+        start = max(0, top - self.overscan)
+        end = min(total, top + visible + self.overscan)
+        window = self.rows[start:end]
+
+        while len(self._pool) < len(window):
+            self._pool.append(self.tree.insert("", "end"))
+        while len(self._pool) > len(window):
+            self.tree.delete(self._pool.pop())
+
+        self._items.clear()
+        self._rows_by_item.clear()
+        for item, row_id in zip(self._pool, window):
+            self.tree.item(item, values=self.row_values(row_id))
+            self._items[row_id] = item
+            self._rows_by_item[item] = row_id
+
+        self._start = start
+        self.top = top
+        if window:
+            self.tree.yview_moveto((top - start) / len(window))
+
+        selected = self._items.get(self.selected) if self.selected else None
+        if selected:
+            self.tree.selection_set(selected)
+            self.tree.focus(selected)
+        elif self.tree.selection():
+            self.tree.selection_set(())
+        self._update_scrollbar()
+
+    def see(self, row_id: str):
+        try:
+            index = self.rows.index(row_id)
+        except ValueError:
+            return
+        if not self.top <= index < self.top + self.visible_rows:
+            self.render(index - self.visible_rows // 2)
+
+    def yview(self, *args):
+        total = len(self.rows)
+        if not args or not total:
+            return
+        if args[0] == "moveto":
+            self.render(int(float(args[1]) * total))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.visible_rows if args[2] == "pages" else 1)
+            self.render(self.top + step)
+
+    def _jump(self, direction: int):
+        if self.rows:
+            self.selected = self.rows[0 if direction < 0 else -1]
+            self.render(0 if direction < 0 else len(self.rows))
+        return "break"
+
+    def _on_select(self, _event):
+        selection = self.tree.selection()
+        if selection:
+            self.selected = self._rows_by_item.get(selection[0], self.selected)
+
+    def _on_tree_scroll(self, first, _last):
+        if not self._pool:
+            self._update_scrollbar()
+            return
+
+        top = self._start + round(float(first) * len(self._pool))
+        if top != self.top:
+            self.top = top
+            margin = self.overscan // 2
+            end = self._start + len(self._pool)
+            if (top - self._start < margin and self._start > 0) or \
+                    (end - (top + self.visible_rows) < margin and end < len(self.rows)):
+                self.schedule_render()
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = len(self.rows)
+        if not total:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible_rows) / total))